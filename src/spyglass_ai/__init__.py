@@ -1,66 +1,43 @@
+import importlib
+
 from .openai import spyglass_openai
 from .otel import configure_spyglass
 from .trace import spyglass_trace
 
-# LangChain AWS integrations
-try:
-    from .langchain_aws import spyglass_chatbedrockconverse
-
-    _LANGCHAIN_AWS_AVAILABLE = True
-except ImportError:
-    _LANGCHAIN_AWS_AVAILABLE = False
-
-# LangChain OpenAI integrations
-try:
-    from .langchain_openai import spyglass_chatopenai
-
-    _LANGCHAIN_OPENAI_AVAILABLE = True
-except ImportError:
-    _LANGCHAIN_OPENAI_AVAILABLE = False
-
-# LangChain Azure OpenAI integrations
-try:
-    from .langchain_azure import spyglass_azure_chatopenai
-
-    _LANGCHAIN_AZURE_AVAILABLE = True
-except ImportError:
-    _LANGCHAIN_AZURE_AVAILABLE = False
-
-# MCP tools integrations
-try:
-    from .mcp_tools import (
-        spyglass_mcp_tools,
-        spyglass_mcp_tools_async,
-        wrap_mcp_session,
-    )
-
-    _MCP_TOOLS_AVAILABLE = True
-except ImportError:
-    _MCP_TOOLS_AVAILABLE = False
-
-# Pydantic AI integrations
-try:
-    from .pydantic import spyglass_pydantic
-
-    _PYDANTIC_AI_AVAILABLE = True
-except ImportError:
-    _PYDANTIC_AI_AVAILABLE = False
+# Optional integrations, imported on first access (PEP 562) so that importing spyglass_ai
+# does not load integrations, or their dependencies, that the application never uses
+_LAZY_IMPORTS = {
+    # LangChain AWS integrations
+    "spyglass_chatbedrockconverse": ".langchain_aws",
+    # LangChain OpenAI integrations
+    "spyglass_chatopenai": ".langchain_openai",
+    # LangChain Azure OpenAI integrations
+    "spyglass_azure_chatopenai": ".langchain_azure",
+    # MCP tools integrations
+    "spyglass_mcp_tools": ".mcp_tools",
+    "spyglass_mcp_tools_async": ".mcp_tools",
+    "wrap_mcp_session": ".mcp_tools",
+    # Pydantic AI integrations
+    "spyglass_pydantic": ".pydantic",
+    # Semantic response cache
+    "SemanticCache": ".semantic_cache",
+    "BatchingEmbedder": ".semantic_cache",
+}
 
 # Base exports
-__all__ = ["spyglass_trace", "spyglass_openai", "configure_spyglass"]
+__all__ = ["spyglass_trace", "spyglass_openai", "configure_spyglass", *_LAZY_IMPORTS]
 
-# Add conditional exports
-if _LANGCHAIN_AWS_AVAILABLE:
-    __all__.append("spyglass_chatbedrockconverse")
 
-if _LANGCHAIN_OPENAI_AVAILABLE:
-    __all__.append("spyglass_chatopenai")
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-if _LANGCHAIN_AZURE_AVAILABLE:
-    __all__.append("spyglass_azure_chatopenai")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache on the package so later lookups skip this hook
+    globals()[name] = value
+    return value
 
-if _MCP_TOOLS_AVAILABLE:
-    __all__.extend(["spyglass_mcp_tools", "spyglass_mcp_tools_async", "wrap_mcp_session"])
 
-if _PYDANTIC_AI_AVAILABLE:
-    __all__.append("spyglass_pydantic")
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -0,0 +1,157 @@
+"""Helpers for serializing GenAI message attributes onto spans."""
+
+import json
+import logging
+import os
+from typing import Any, List, Tuple
+
+try:
+    import orjson
+
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_TRUE_VALUES = ("1", "true", "yes", "on")
+_FALSE_VALUES = ("0", "false", "no", "off")
+
+
+def _invalid_setting(name: str, expected: str, value: str, default: Any) -> Any:
+    """Warn about an invalid setting and return its default."""
+    # These settings are read when spyglass_ai is imported, so a bad value must not raise
+    logger.warning("%s must be %s, got %r; using the default %r.", name, expected, value, default)
+    return default
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    """Read a boolean flag from the environment, falling back to the default if invalid."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+
+    value = value.strip().lower()
+    if value in _TRUE_VALUES:
+        return True
+    if value in _FALSE_VALUES:
+        return False
+    return _invalid_setting(name, "true or false", value, default)
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a non-negative integer setting from the environment, falling back if invalid."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+
+    try:
+        setting = int(value)
+    except ValueError:
+        setting = -1
+    if setting < 0:
+        return _invalid_setting(name, "a non-negative integer", value, default)
+
+    return setting
+
+
+def _env_choice(name: str, choices: Tuple[str, ...], default: str) -> str:
+    """Read one of a fixed set of values from the environment, falling back if invalid."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+
+    value = value.strip().lower()
+    if value not in choices:
+        return _invalid_setting(name, f"one of {', '.join(choices)}", value, default)
+
+    return value
+
+
+# Amount of detail recorded on GenAI spans: "full" (default), "minimal" (system, model
+# and token counts only) or "off" (span name, timing and status only)
+TRACE_LEVEL = _env_choice("SPYGLASS_TRACE_LEVEL", ("off", "minimal", "full"), "full")
+
+# Request attributes recorded at the minimal trace level
+MINIMAL_ATTRIBUTES = frozenset(("gen_ai.system", "gen_ai.request.model"))
+
+# Whether full message bodies are recorded. When disabled, only the message count and
+# total content length are recorded, skipping message formatting and serialization.
+MESSAGE_BODIES_ENABLED = _env_flag("SPYGLASS_TRACE_MESSAGE_BODIES", True)
+
+# Maximum size in bytes of a message JSON attribute. Larger values keep their head and
+# tail around a truncation marker. Zero disables the limit.
+MAX_ATTR_BYTES = _env_int("SPYGLASS_MAX_ATTR_BYTES", 8192)
+
+
+def dumps(value: Any) -> str:
+    """Serialize a value to a JSON string, using orjson when it is installed."""
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value)
+
+
+def content_length(messages: List[Any]) -> int:
+    """Count the text characters across messages (dicts or objects with ``content``)."""
+    total = 0
+    for message in messages:
+        if isinstance(message, dict):
+            content = message.get("content")
+        else:
+            content = getattr(message, "content", None)
+
+        if isinstance(content, str):
+            total += len(content)
+        elif isinstance(content, list):
+            for part in content:
+                if isinstance(part, str):
+                    total += len(part)
+                elif isinstance(part, dict) and isinstance(part.get("text"), str):
+                    total += len(part["text"])
+
+    return total
+
+
+def truncate(value: str, max_bytes: int) -> Tuple[str, int]:
+    """
+    Bound a string to ``max_bytes`` UTF-8 bytes, keeping its head and tail.
+
+    Returns the (possibly truncated) string and the number of bytes removed.
+    """
+    encoded = value.encode("utf-8")
+    if max_bytes <= 0 or len(encoded) <= max_bytes:
+        return value, 0
+
+    # Size the marker for the largest possible count so the result never exceeds max_bytes
+    marker_size = len(f"...truncated {len(encoded)} bytes...")
+    if marker_size > max_bytes:
+        # No room for the marker, so keep only as much of the head as fits
+        head = encoded[:max_bytes].decode("utf-8", "ignore")
+        return head, len(encoded) - len(head.encode("utf-8"))
+
+    keep = max_bytes - marker_size
+    head = keep - keep // 2
+    tail = keep // 2
+    removed = len(encoded) - head - tail
+    marker = f"...truncated {removed} bytes..."
+
+    # Slicing may split a multi-byte character, so drop any partial characters at the cut
+    truncated = (
+        encoded[:head].decode("utf-8", "ignore")
+        + marker
+        + (encoded[-tail:].decode("utf-8", "ignore") if tail else "")
+    )
+    return truncated, removed
+
+
+def set_bounded_attribute(span, key: str, value: str) -> None:
+    """
+    Set a JSON string attribute bounded to SPYGLASS_MAX_ATTR_BYTES.
+
+    When the value is truncated, the number of removed bytes is recorded as
+    ``<key>.truncated_bytes``.
+    """
+    value, removed = truncate(value, MAX_ATTR_BYTES)
+    span.set_attribute(key, value)
+    if removed:
+        span.set_attribute(f"{key}.truncated_bytes", removed)
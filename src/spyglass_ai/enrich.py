@@ -0,0 +1,65 @@
+"""Background span enrichment, keeping attribute formatting off the request thread."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from opentelemetry.trace import Span, Status, StatusCode
+
+# Attribute values only need to be present before a span ends, and spans are exported
+# asynchronously anyway, so formatting and serialization can finish after the wrapped
+# call has returned. Worker threads are joined at interpreter exit, before the tracer
+# provider flushes its remaining spans.
+_ENRICH_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="spyglass-enrich")
+
+
+def finish_span(span: Span, enrich: Callable[..., None], *args: Any) -> None:
+    """
+    Call ``enrich(span, *args)``, mark the span OK and end it on a background thread.
+
+    The span must have been started with ``end_on_exit=False``. Spans that are not
+    recording are skipped, since nothing set on them is exported.
+    """
+    if not span.is_recording():
+        return
+
+    # Record the end time now so the span's duration covers only the wrapped call, not the
+    # time spent queued for, or formatting on, an enrichment thread
+    end_time = time.time_ns()
+    _ENRICH_POOL.submit(_finish_span, span, enrich, args, end_time)
+
+
+def _finish_span(
+    span: Span, enrich: Callable[..., None], args: tuple, end_time: Optional[int] = None
+) -> None:
+    """Enrich and end a span whose wrapped call completed successfully."""
+    try:
+        enrich(span, *args)
+    except Exception:
+        # If attribute capture fails, don't break the span
+        span.set_attribute("spyglass.enrich.capture_error", True)
+    finally:
+        span.set_status(Status(StatusCode.OK))
+        span.end(end_time=end_time)
+
+
+def fail_span(span: Span, error: BaseException, enrich: Callable[..., None], *args: Any) -> None:
+    """
+    Call ``enrich(span, *args)``, record ``error`` and end the span on the calling thread.
+
+    Used for wrapped calls that raised, including cancellations and interrupts, so spans
+    started with ``end_on_exit=False`` are always ended. Attribute capture failures never
+    replace the original error.
+    """
+    try:
+        enrich(span, *args)
+    except Exception:
+        # If attribute capture fails, don't break the span
+        span.set_attribute("spyglass.enrich.capture_error", True)
+    finally:
+        try:
+            if isinstance(error, Exception):
+                span.record_exception(error)
+            span.set_status(Status(StatusCode.ERROR, str(error)))
+        finally:
+            span.end()
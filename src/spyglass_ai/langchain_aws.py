@@ -1,9 +1,8 @@
 import functools
-import json
-from typing import Any, Dict, List
-
-from opentelemetry.trace import Status, StatusCode
 
+from .attributes import MINIMAL_ATTRIBUTES, TRACE_LEVEL
+from .enrich import fail_span, finish_span
+from .langchain_messages import set_langchain_messages_attribute, snapshot_langchain_response
 from .otel import spyglass_tracer
 
 
@@ -18,14 +17,24 @@ def spyglass_chatbedrockconverse(llm_instance):
         llm_instance: A ChatBedrockConverse instance
 
     Returns:
-        The same instance with tracing enabled
+        The same instance with tracing enabled. Wrapping an already wrapped instance
+        returns it unchanged.
     """
+    # Wrapping again would nest another tracing layer around _generate on every call
+    if getattr(llm_instance, "__spyglass_wrapped__", False):
+        return llm_instance
+
+    # Snapshot model, region and provider attributes once instead of probing them on every
+    # call. Sampling parameters such as temperature are still read per call
+    llm_instance.__spyglass_attrs__ = _snapshot_request_attributes(llm_instance)
+
     # Wrap the core generation methods
     _wrap_generate_method(llm_instance)
 
     # Wrap async methods if available
     _wrap_async_methods(llm_instance)
 
+    llm_instance.__spyglass_wrapped__ = True
     return llm_instance
 
 
@@ -34,28 +43,33 @@ def _wrap_generate_method(llm_instance):
     original_generate = llm_instance._generate
 
     def traced_generate(messages, stop=None, run_manager=None, **kwargs):
-        # Set record_exception=False since we manually record exceptions in the except block
+        # Exceptions are recorded and the span is ended manually. On success, the span is
+        # enriched and ended in the background so the result is returned without waiting
         with spyglass_tracer.start_as_current_span(
-            "bedrock.chat.generate", record_exception=False
+            "bedrock.chat.generate",
+            record_exception=False,
+            set_status_on_exception=False,
+            end_on_exit=False,
         ) as span:
             try:
-                # Set Bedrock-specific attributes
-                _set_bedrock_attributes(span, llm_instance, messages, kwargs)
-
                 # Call original method
                 result = original_generate(messages, stop, run_manager, **kwargs)
-
-                # Extract response attributes
-                _set_response_attributes(span, result)
-
-                span.set_status(Status(StatusCode.OK))
-                return result
-
-            except Exception as e:
-                span.record_exception(e)
-                span.set_status(Status(StatusCode.ERROR, str(e)))
+            except BaseException as e:
+                # Also covers cancellation (e.g. timeouts) and interrupts, which would
+                # otherwise leave the span open and never exported
+                fail_span(span, e, _set_bedrock_attributes, llm_instance, messages, kwargs)
                 raise
 
+        # Copy the message list, which callers commonly append to once the call returns, and
+        # capture the request parameters and response now, since the instance may be
+        # reconfigured and LangChain updates the response after _generate returns
+        request_attributes = _request_attributes(llm_instance)
+        response = snapshot_langchain_response(result)
+        finish_span(
+            span, _set_span_attributes, request_attributes, list(messages), dict(kwargs), response
+        )
+        return result
+
     # Safely wrap function metadata, handling union type annotations
     # Skip functools.wraps() entirely to avoid UnionType issues in Python 3.10+
     # Instead, manually copy safe attributes
@@ -70,31 +84,81 @@ def _wrap_generate_method(llm_instance):
     llm_instance._generate = traced_generate
 
 
+# Model parameters recorded when set, as (instance attribute, GenAI semantic convention key)
+_PARAMETER_ATTRIBUTES = (
+    ("temperature", "gen_ai.request.temperature"),
+    ("max_tokens", "gen_ai.request.max_tokens"),
+    ("top_p", "gen_ai.request.top_p"),
+)
+
+
+def _snapshot_request_attributes(llm_instance):
+    """Collect the span attributes that identify the Bedrock model and its configuration"""
+    attributes = [
+        ("gen_ai.operation.name", "chat"),
+        ("gen_ai.system", "aws_bedrock"),
+        ("gen_ai.request.model", llm_instance.model_id),
+        # AWS Bedrock specific attributes (using gen_ai prefix for consistency)
+        ("gen_ai.request.aws.region", llm_instance.region_name or "us-east-1"),
+        ("gen_ai.request.aws.provider", llm_instance.provider),
+    ]
+
+    # AWS Bedrock specific configurations
+    if llm_instance.guardrail_config:
+        attributes.append(("gen_ai.request.aws.guardrails.enabled", True))
+    if llm_instance.performance_config:
+        attributes.append(("gen_ai.request.aws.performance_config.enabled", True))
+
+    return tuple(attributes)
+
+
+def _request_attributes(llm_instance):
+    """Collect the request attributes of a call, reading the current sampling parameters"""
+    attributes = getattr(llm_instance, "__spyglass_attrs__", None)
+    if attributes is None:
+        attributes = _snapshot_request_attributes(llm_instance)
+
+    # Sampling parameters are commonly changed on a wrapped instance, so read them per call
+    parameters = []
+    for name, key in _PARAMETER_ATTRIBUTES:
+        value = getattr(llm_instance, name, None)
+        if value is not None:
+            parameters.append((key, value))
+
+    return attributes + tuple(parameters)
+
+
+def _set_span_attributes(span, request_attributes, messages, kwargs, response):
+    """Set request and response attributes for a completed generation"""
+    _set_request_attributes(span, request_attributes, messages, kwargs)
+    _set_response_snapshot_attributes(span, response)
+
+
 def _set_bedrock_attributes(span, llm_instance, messages, kwargs):
     """Set span attributes following GenAI semantic conventions"""
-    # GenAI semantic convention attributes
-    span.set_attribute("gen_ai.operation.name", "chat")
-    span.set_attribute("gen_ai.system", "aws_bedrock")
-    span.set_attribute("gen_ai.request.model", llm_instance.model_id)
-
-    # AWS Bedrock specific attributes (using gen_ai prefix for consistency)
-    span.set_attribute("gen_ai.request.aws.region", llm_instance.region_name or "us-east-1")
-    span.set_attribute("gen_ai.request.aws.provider", llm_instance.provider)
-
-    # Model parameters (GenAI semantic conventions)
-    if llm_instance.temperature is not None:
-        span.set_attribute("gen_ai.request.temperature", llm_instance.temperature)
-    if llm_instance.max_tokens is not None:
-        span.set_attribute("gen_ai.request.max_tokens", llm_instance.max_tokens)
-    if llm_instance.top_p is not None:
-        span.set_attribute("gen_ai.request.top_p", llm_instance.top_p)
+    _set_request_attributes(span, _request_attributes(llm_instance), messages, kwargs)
+
+
+def _set_request_attributes(span, request_attributes, messages, kwargs):
+    """Set request attributes collected by _request_attributes on a span"""
+    # Nothing is exported for spans that are not recording, so skip building attributes
+    if not span.is_recording() or TRACE_LEVEL == "off":
+        return
+
+    # Model attributes snapshotted when the instance was wrapped, and the parameters of this call
+    for key, value in request_attributes:
+        if TRACE_LEVEL == "full" or key in MINIMAL_ATTRIBUTES:
+            span.set_attribute(key, value)
+
+    # Minimal tracing records only the system and model of the request
+    if TRACE_LEVEL == "minimal":
+        return
 
     # Message information (GenAI semantic conventions)
     span.set_attribute("gen_ai.input.messages.count", len(messages))
 
     # Format and record input messages
-    formatted_messages = _format_langchain_messages(messages)
-    span.set_attribute("gen_ai.input.messages", json.dumps(formatted_messages))
+    set_langchain_messages_attribute(span, "gen_ai.input.messages", messages)
 
     # Tool information from kwargs (when tools are bound)
     if "tools" in kwargs:
@@ -109,23 +173,25 @@ def _set_bedrock_attributes(span, llm_instance, messages, kwargs):
         if tool_names:
             span.set_attribute("gen_ai.request.tools.names", ",".join(tool_names))
 
-    # AWS Bedrock specific configurations
-    if llm_instance.guardrail_config:
-        span.set_attribute("gen_ai.request.aws.guardrails.enabled", True)
-
-    if llm_instance.performance_config:
-        span.set_attribute("gen_ai.request.aws.performance_config.enabled", True)
-
 
 def _set_response_attributes(span, result):
     """Set response-specific attributes following GenAI semantic conventions"""
-    if hasattr(result, "generations") and result.generations:
-        generation = result.generations[0]
-        message = generation.message
+    if span.is_recording() and TRACE_LEVEL != "off":
+        _set_response_snapshot_attributes(span, snapshot_langchain_response(result))
+
+
+def _set_response_snapshot_attributes(span, response):
+    """Set response attributes from a snapshot taken by snapshot_langchain_response"""
+    # Nothing is exported for spans that are not recording, so skip building attributes
+    if not span.is_recording() or TRACE_LEVEL == "off":
+        return
+
+    if response is not None:
+        message = response.message
 
         # Usage metadata (LangChain extracts from Converse "usage")
-        if hasattr(message, "usage_metadata") and message.usage_metadata:
-            usage = message.usage_metadata
+        if response.usage_metadata:
+            usage = response.usage_metadata
 
             # Handle the actual format returned by LangChain AWS
             if isinstance(usage, dict):
@@ -170,9 +236,12 @@ def _set_response_attributes(span, result):
                             details["cache_creation"],
                         )
 
+        # Minimal tracing records only the token counts of the response
+        if TRACE_LEVEL == "minimal":
+            return
+
         # Format and record output messages
-        formatted_output = _format_langchain_messages([message])
-        span.set_attribute("gen_ai.output.messages", json.dumps(formatted_output))
+        set_langchain_messages_attribute(span, "gen_ai.output.messages", [message])
 
         # Tool calls
         if hasattr(message, "tool_calls") and message.tool_calls:
@@ -181,8 +250,8 @@ def _set_response_attributes(span, result):
             span.set_attribute("gen_ai.response.tools.names", ",".join(tool_names))
 
         # Response metadata (LangChain adds model_name and preserves Converse response fields)
-        if hasattr(message, "response_metadata") and message.response_metadata:
-            metadata = message.response_metadata
+        if response.response_metadata:
+            metadata = response.response_metadata
 
             # Model name (LangChain always sets this)
             if "model_name" in metadata:
@@ -214,28 +283,33 @@ def _wrap_agenerate_method(llm_instance):
     original_agenerate = llm_instance._agenerate
 
     async def traced_agenerate(messages, stop=None, run_manager=None, **kwargs):
-        # Set record_exception=False since we manually record exceptions in the except block
+        # Exceptions are recorded and the span is ended manually. On success, the span is
+        # enriched and ended in the background so the result is returned without waiting
         with spyglass_tracer.start_as_current_span(
-            "bedrock.chat.agenerate", record_exception=False
+            "bedrock.chat.agenerate",
+            record_exception=False,
+            set_status_on_exception=False,
+            end_on_exit=False,
         ) as span:
             try:
-                # Set Bedrock-specific attributes
-                _set_bedrock_attributes(span, llm_instance, messages, kwargs)
-
                 # Call original method
                 result = await original_agenerate(messages, stop, run_manager, **kwargs)
-
-                # Extract response attributes
-                _set_response_attributes(span, result)
-
-                span.set_status(Status(StatusCode.OK))
-                return result
-
-            except Exception as e:
-                span.record_exception(e)
-                span.set_status(Status(StatusCode.ERROR, str(e)))
+            except BaseException as e:
+                # Also covers cancellation (e.g. timeouts) and interrupts, which would
+                # otherwise leave the span open and never exported
+                fail_span(span, e, _set_bedrock_attributes, llm_instance, messages, kwargs)
                 raise
 
+        # Copy the message list, which callers commonly append to once the call returns, and
+        # capture the request parameters and response now, since the instance may be
+        # reconfigured and LangChain updates the response after _generate returns
+        request_attributes = _request_attributes(llm_instance)
+        response = snapshot_langchain_response(result)
+        finish_span(
+            span, _set_span_attributes, request_attributes, list(messages), dict(kwargs), response
+        )
+        return result
+
     # Safely wrap function metadata, handling union type annotations
     # Skip functools.wraps() entirely to avoid UnionType issues in Python 3.10+
     # Instead, manually copy safe attributes
@@ -250,64 +324,3 @@ def _wrap_agenerate_method(llm_instance):
         pass  # If copying fails, continue without metadata
 
     llm_instance._agenerate = traced_agenerate
-
-
-def _format_langchain_messages(messages: List[Any]) -> List[Dict[str, Any]]:
-    """Format LangChain messages (input or output) to GenAI semantic convention format."""
-    formatted_messages = []
-
-    for message in messages:
-        # Extract role and content from LangChain message objects
-        if hasattr(message, "__class__"):
-            message_type = message.__class__.__name__.lower()
-            if "human" in message_type or "user" in message_type:
-                role = "user"
-            elif "ai" in message_type or "assistant" in message_type:
-                role = "assistant"
-            elif "system" in message_type:
-                role = "system"
-            elif "tool" in message_type:
-                role = "tool"
-            else:
-                role = "unknown"
-        else:
-            role = "unknown"
-
-        # Extract content
-        content = ""
-        if hasattr(message, "content"):
-            if isinstance(message.content, str):
-                content = message.content
-            elif isinstance(message.content, list):
-                # Handle complex content like images, etc.
-                text_parts = []
-                for part in message.content:
-                    if isinstance(part, dict) and part.get("type") == "text":
-                        text_parts.append(part.get("text", ""))
-                    elif isinstance(part, str):
-                        text_parts.append(part)
-                content = " ".join(text_parts)
-
-        formatted_message = {"role": role, "content": content}
-
-        # Handle tool calls if present
-        if hasattr(message, "tool_calls") and message.tool_calls:
-            formatted_message["tool_calls"] = [
-                {
-                    "id": tc.get("id", ""),
-                    "type": "function",
-                    "function": {
-                        "name": tc.get("name", ""),
-                        "arguments": json.dumps(tc.get("args", {})) if tc.get("args") else "",
-                    },
-                }
-                for tc in message.tool_calls
-            ]
-
-        # Handle tool call results
-        if hasattr(message, "tool_call_id"):
-            formatted_message["tool_call_id"] = message.tool_call_id
-
-        formatted_messages.append(formatted_message)
-
-    return formatted_messages
@@ -0,0 +1,181 @@
+"""Shared formatting of LangChain messages for GenAI span attributes."""
+
+import functools
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from .attributes import MESSAGE_BODIES_ENABLED, content_length, dumps, set_bounded_attribute
+
+# Roles of the core LangChain message classes; subclasses such as AIMessageChunk are
+# resolved through their MRO. Filled on first use by _load_role_map().
+_ROLE_MAP = {}
+_ROLE_MAP_LOADED = False
+
+# Distinguishes a missing attribute from one set to None with a single getattr
+_MISSING = object()
+
+# Class-name keywords checked in priority order for message classes outside _ROLE_MAP
+_ROLE_KEYWORDS = (
+    (("human", "user"), "user"),
+    (("ai", "assistant"), "assistant"),
+    (("system",), "system"),
+    (("tool",), "tool"),
+)
+
+
+def _role_from_class_name(class_name: str) -> str:
+    """Map a message class name to a GenAI role by keyword."""
+    message_type = class_name.lower()
+    for keywords, role in _ROLE_KEYWORDS:
+        for keyword in keywords:
+            if keyword in message_type:
+                return role
+    return "unknown"
+
+
+def _load_role_map() -> None:
+    """
+    Fill _ROLE_MAP from langchain_core.
+
+    Deferred until the first message is formatted, by which point the application has
+    already imported langchain_core, so importing spyglass_ai does not pay for it.
+    """
+    global _ROLE_MAP_LOADED
+
+    if _ROLE_MAP_LOADED:
+        return
+
+    try:
+        from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+    except ImportError:
+        pass
+    else:
+        # Filling the map is idempotent, so concurrent first calls need no lock
+        _ROLE_MAP.update(
+            {
+                HumanMessage: "user",
+                AIMessage: "assistant",
+                SystemMessage: "system",
+                ToolMessage: "tool",
+            }
+        )
+
+    _ROLE_MAP_LOADED = True
+
+
+@functools.lru_cache(maxsize=256)
+def _resolve_role(message_class: type) -> str:
+    """Resolve the role of a message class outside _ROLE_MAP, once per class."""
+    _load_role_map()
+    for base in message_class.__mro__:
+        role = _ROLE_MAP.get(base)
+        if role is not None:
+            return role
+    return _role_from_class_name(message_class.__name__)
+
+
+def _message_role(message: Any) -> str:
+    """Return the GenAI role of a LangChain message."""
+    message_class = message.__class__
+    return _ROLE_MAP.get(message_class) or _resolve_role(message_class)
+
+
+def _format_tool_arguments(args: Any) -> str:
+    """Serialize tool call args to the JSON string form used by OpenAI messages."""
+    return dumps(args) if args else ""
+
+
+def format_langchain_messages(messages: List[Any]) -> List[Dict[str, Any]]:
+    """Format LangChain messages (input or output) to GenAI semantic convention format."""
+    formatted_messages = [None] * len(messages)
+
+    for i, message in enumerate(messages):
+        # Extract role from the LangChain message class
+        role = _message_role(message)
+
+        # Extract content; plain strings, by far the most common, take a single type check
+        content = getattr(message, "content", "")
+        if content.__class__ is not str:
+            if isinstance(content, list):
+                # Handle complex content like images, etc.
+                text_parts = []
+                for part in content:
+                    if isinstance(part, str):
+                        text_parts.append(part)
+                    elif isinstance(part, dict) and part.get("type") == "text":
+                        text_parts.append(part.get("text", ""))
+                content = " ".join(text_parts)
+            elif not isinstance(content, str):
+                content = ""
+
+        formatted_message = {"role": role, "content": content}
+
+        # Handle tool calls if present
+        tool_calls = getattr(message, "tool_calls", None)
+        if tool_calls:
+            formatted_message["tool_calls"] = [
+                {
+                    "id": tc.get("id", ""),
+                    "type": "function",
+                    "function": {
+                        "name": tc.get("name", ""),
+                        # A JSON string, as in OpenAI messages, with "" for calls without args
+                        "arguments": _format_tool_arguments(tc.get("args")),
+                    },
+                }
+                for tc in tool_calls
+            ]
+
+        # Handle tool call results
+        tool_call_id = getattr(message, "tool_call_id", _MISSING)
+        if tool_call_id is not _MISSING:
+            formatted_message["tool_call_id"] = tool_call_id
+
+        formatted_messages[i] = formatted_message
+
+    return formatted_messages
+
+
+def set_langchain_messages_attribute(span, key: str, messages: List[Any]) -> None:
+    """
+    Record LangChain messages on a span as GenAI semantic convention JSON.
+
+    Nothing is formatted for spans that are not recording. The JSON is truncated to
+    SPYGLASS_MAX_ATTR_BYTES. When message bodies are disabled via
+    SPYGLASS_TRACE_MESSAGE_BODIES, only the total content length is recorded.
+    """
+    if not span.is_recording():
+        return
+
+    if MESSAGE_BODIES_ENABLED:
+        set_bounded_attribute(span, key, dumps(format_langchain_messages(messages)))
+    else:
+        span.set_attribute(f"{key}.content_length", content_length(messages))
+
+
+class LangChainResponse(NamedTuple):
+    """The parts of a LangChain ChatResult that are recorded as response attributes."""
+
+    message: Any
+    usage_metadata: Any
+    response_metadata: Any
+    llm_output: Any
+
+
+def snapshot_langchain_response(result: Any) -> Optional[LangChainResponse]:
+    """
+    Capture the fields of a ChatResult that response attributes are built from.
+
+    LangChain reassigns ``generation.message`` and ``message.response_metadata`` right after
+    ``_generate`` returns, so these references are taken on the calling thread before the
+    span is handed to a background thread. Returns None when there are no generations.
+    """
+    if not (hasattr(result, "generations") and result.generations):
+        return None
+
+    message = result.generations[0].message
+    return LangChainResponse(
+        message=message,
+        usage_metadata=getattr(message, "usage_metadata", None),
+        response_metadata=getattr(message, "response_metadata", None),
+        llm_output=getattr(result, "llm_output", None),
+    )
@@ -1,9 +1,15 @@
 import functools
-import json
 from typing import Any, Dict, List
 
 from opentelemetry.trace import Status, StatusCode
 
+from .attributes import (
+    MESSAGE_BODIES_ENABLED,
+    TRACE_LEVEL,
+    content_length,
+    dumps,
+    set_bounded_attribute,
+)
 from .otel import spyglass_tracer
 
 # TODO: Implement wrappers the different client types (sync, async, streaming)
@@ -23,100 +29,31 @@ def spyglass_openai(client_instance):
         client_instance: An OpenAI client instance (sync or async)
 
     Returns:
-        The same client instance with tracing enabled
+        The same client instance with tracing enabled. Wrapping an already wrapped client
+        returns it unchanged.
     """
+    # Wrapping again would nest another tracing layer around create on every call
+    if getattr(client_instance, "__spyglass_wrapped__", False):
+        return client_instance
+
     # Get a reference to the original method we want to wrap.
     original_create_method = client_instance.chat.completions.create
 
     @functools.wraps(original_create_method)
     def new_method_for_client(*args, **kwargs):
-        # Start a new span
         # Set record_exception=False since we manually record exceptions in the except block
         with spyglass_tracer.start_as_current_span(
             "openai.chat.completions.create", record_exception=False
         ) as span:
             try:
                 # Set OpenTelemetry GenAI semantic convention attributes
-                span.set_attribute("gen_ai.operation.name", "chat")
-                span.set_attribute("gen_ai.system", "openai")
-
-                # Model information
-                if "model" in kwargs:
-                    span.set_attribute("gen_ai.request.model", kwargs["model"])
-
-                # Request parameters
-                if "max_tokens" in kwargs:
-                    span.set_attribute("gen_ai.request.max_tokens", kwargs["max_tokens"])
-                if "temperature" in kwargs:
-                    span.set_attribute("gen_ai.request.temperature", kwargs["temperature"])
-                if "top_p" in kwargs:
-                    span.set_attribute("gen_ai.request.top_p", kwargs["top_p"])
-                if "frequency_penalty" in kwargs:
-                    span.set_attribute(
-                        "gen_ai.request.frequency_penalty", kwargs["frequency_penalty"]
-                    )
-                if "presence_penalty" in kwargs:
-                    span.set_attribute(
-                        "gen_ai.request.presence_penalty", kwargs["presence_penalty"]
-                    )
-
-                # Messages and input content
-                if "messages" in kwargs:
-                    messages = kwargs["messages"]
-                    span.set_attribute("gen_ai.input.messages.count", len(messages))
-
-                    # Convert messages to the standard format for GenAI semantic conventions
-                    formatted_messages = _format_openai_messages(messages)
-                    span.set_attribute("gen_ai.input.messages", json.dumps(formatted_messages))
-
-                # Tools information
-                if "tools" in kwargs and kwargs["tools"]:
-                    span.set_attribute("gen_ai.request.tools.count", len(kwargs["tools"]))
-                    tool_names = [
-                        tool.get("function", {}).get("name", "unknown") for tool in kwargs["tools"]
-                    ]
-                    span.set_attribute("gen_ai.request.tools.names", ",".join(tool_names))
+                _set_request_attributes(span, kwargs)
 
                 # Call the original method
                 result = original_create_method(*args, **kwargs)
 
                 # Set response attributes following GenAI semantic conventions
-                if hasattr(result, "model"):
-                    span.set_attribute("gen_ai.response.model", result.model)
-
-                # Usage metadata
-                if hasattr(result, "usage") and result.usage:
-                    if hasattr(result.usage, "prompt_tokens"):
-                        span.set_attribute("gen_ai.usage.input_tokens", result.usage.prompt_tokens)
-                    if hasattr(result.usage, "completion_tokens"):
-                        span.set_attribute(
-                            "gen_ai.usage.output_tokens", result.usage.completion_tokens
-                        )
-                    if hasattr(result.usage, "total_tokens"):
-                        span.set_attribute("gen_ai.usage.total_tokens", result.usage.total_tokens)
-
-                # Response content and messages
-                if hasattr(result, "choices") and result.choices:
-                    span.set_attribute("gen_ai.response.choices.count", len(result.choices))
-
-                    # Format and record response messages
-                    response_messages = _format_openai_response(result.choices)
-                    span.set_attribute("gen_ai.output.messages", json.dumps(response_messages))
-
-                    # Record finish reasons
-                    finish_reasons = [
-                        choice.finish_reason for choice in result.choices if choice.finish_reason
-                    ]
-                    if finish_reasons:
-                        span.set_attribute(
-                            "gen_ai.response.finish_reasons", ",".join(finish_reasons)
-                        )
-
-                # Response metadata
-                if hasattr(result, "id"):
-                    span.set_attribute("gen_ai.response.id", result.id)
-                if hasattr(result, "created"):
-                    span.set_attribute("gen_ai.response.created", result.created)
+                _set_response_attributes(span, result)
 
                 # Set span status to OK for successful calls
                 span.set_status(Status(StatusCode.OK))
@@ -132,9 +69,110 @@ def spyglass_openai(client_instance):
     # Monkey patch the method on the client instance with our wrapper method.
     client_instance.chat.completions.create = new_method_for_client
 
+    client_instance.__spyglass_wrapped__ = True
     return client_instance
 
 
+# Request parameters recorded when passed, as (keyword argument, GenAI semantic convention key)
+_PARAMETER_ATTRIBUTES = (
+    ("max_tokens", "gen_ai.request.max_tokens"),
+    ("temperature", "gen_ai.request.temperature"),
+    ("top_p", "gen_ai.request.top_p"),
+    ("frequency_penalty", "gen_ai.request.frequency_penalty"),
+    ("presence_penalty", "gen_ai.request.presence_penalty"),
+)
+
+
+def _set_request_attributes(span, kwargs):
+    """Set request attributes from the create() keyword arguments"""
+    # Nothing is exported for spans that are not recording, so skip building attributes
+    if not span.is_recording() or TRACE_LEVEL == "off":
+        return
+
+    span.set_attribute("gen_ai.system", "openai")
+
+    # Model information
+    if "model" in kwargs:
+        span.set_attribute("gen_ai.request.model", kwargs["model"])
+
+    # Minimal tracing records only the system and model of the request
+    if TRACE_LEVEL == "minimal":
+        return
+
+    span.set_attribute("gen_ai.operation.name", "chat")
+
+    # Request parameters
+    for name, key in _PARAMETER_ATTRIBUTES:
+        if name in kwargs:
+            span.set_attribute(key, kwargs[name])
+
+    # Messages and input content
+    if "messages" in kwargs:
+        messages = kwargs["messages"]
+        span.set_attribute("gen_ai.input.messages.count", len(messages))
+
+        # Convert messages to the standard format for GenAI semantic conventions
+        if MESSAGE_BODIES_ENABLED:
+            formatted_messages = _format_openai_messages(messages)
+            set_bounded_attribute(span, "gen_ai.input.messages", dumps(formatted_messages))
+        else:
+            span.set_attribute("gen_ai.input.messages.content_length", content_length(messages))
+
+    # Tools information
+    if "tools" in kwargs and kwargs["tools"]:
+        span.set_attribute("gen_ai.request.tools.count", len(kwargs["tools"]))
+        tool_names = [tool.get("function", {}).get("name", "unknown") for tool in kwargs["tools"]]
+        span.set_attribute("gen_ai.request.tools.names", ",".join(tool_names))
+
+
+def _set_response_attributes(span, result):
+    """Set response attributes from a chat completion"""
+    # Nothing is exported for spans that are not recording, so skip building attributes
+    if not span.is_recording() or TRACE_LEVEL == "off":
+        return
+
+    # Usage metadata
+    if hasattr(result, "usage") and result.usage:
+        if hasattr(result.usage, "prompt_tokens"):
+            span.set_attribute("gen_ai.usage.input_tokens", result.usage.prompt_tokens)
+        if hasattr(result.usage, "completion_tokens"):
+            span.set_attribute("gen_ai.usage.output_tokens", result.usage.completion_tokens)
+        if hasattr(result.usage, "total_tokens"):
+            span.set_attribute("gen_ai.usage.total_tokens", result.usage.total_tokens)
+
+    # Minimal tracing records only the token counts of the response
+    if TRACE_LEVEL == "minimal":
+        return
+
+    if hasattr(result, "model"):
+        span.set_attribute("gen_ai.response.model", result.model)
+
+    # Response content and messages
+    if hasattr(result, "choices") and result.choices:
+        span.set_attribute("gen_ai.response.choices.count", len(result.choices))
+
+        # Format and record response messages
+        if MESSAGE_BODIES_ENABLED:
+            response_messages = _format_openai_response(result.choices)
+            set_bounded_attribute(span, "gen_ai.output.messages", dumps(response_messages))
+        else:
+            response_messages = [getattr(choice, "message", None) for choice in result.choices]
+            span.set_attribute(
+                "gen_ai.output.messages.content_length", content_length(response_messages)
+            )
+
+        # Record finish reasons
+        finish_reasons = [choice.finish_reason for choice in result.choices if choice.finish_reason]
+        if finish_reasons:
+            span.set_attribute("gen_ai.response.finish_reasons", ",".join(finish_reasons))
+
+    # Response metadata
+    if hasattr(result, "id"):
+        span.set_attribute("gen_ai.response.id", result.id)
+    if hasattr(result, "created"):
+        span.set_attribute("gen_ai.response.created", result.created)
+
+
 def _format_openai_messages(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Format OpenAI messages to GenAI semantic convention format."""
     formatted_messages = []
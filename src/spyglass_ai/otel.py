@@ -1,7 +1,19 @@
+"""OpenTelemetry setup for exporting Spyglass traces.
+
+Span batching can be tuned with the following environment variables, which mirror
+the standard ``OTEL_BSP_*`` settings (delays and timeouts in milliseconds):
+
+- ``SPYGLASS_OTEL_BSP_MAX_QUEUE_SIZE`` (default 16384)
+- ``SPYGLASS_OTEL_BSP_MAX_EXPORT_BATCH_SIZE`` (default 2048)
+- ``SPYGLASS_OTEL_BSP_SCHEDULE_DELAY`` (default 2000)
+- ``SPYGLASS_OTEL_BSP_EXPORT_TIMEOUT`` (default 30000)
+"""
+
+import atexit
 import os
 
 from opentelemetry import trace
-from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.exporter.otlp.proto.http import Compression
 from opentelemetry.sdk.resources import Resource
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
@@ -25,6 +37,16 @@ class DeploymentConfigurationError(SpyglassOtelError):
     pass
 
 
+# Batch span processor defaults. GenAI spans carry large message attributes, so the
+# queue is sized well above the SDK default to avoid dropping spans under load, and
+# larger batches amortize the per-request cost of each export.
+_BSP_DEFAULTS = {
+    "SPYGLASS_OTEL_BSP_MAX_QUEUE_SIZE": 16384,
+    "SPYGLASS_OTEL_BSP_MAX_EXPORT_BATCH_SIZE": 2048,
+    "SPYGLASS_OTEL_BSP_SCHEDULE_DELAY": 2000,
+    "SPYGLASS_OTEL_BSP_EXPORT_TIMEOUT": 30000,
+}
+
 # Module-level configuration storage for programmatic configuration
 _config = {
     "api_key": None,
@@ -80,6 +102,7 @@ def configure_spyglass(
 
     # Reset tracer so it reinitializes with new config
     _spyglass_tracer = None
+    spyglass_tracer._reset()
 
 
 def _create_resource():
@@ -101,6 +124,32 @@ def _create_resource():
     return Resource.create(resource_attributes)
 
 
+# HTTP session shared by all exporters so keep-alive connections to the ingest endpoint
+# are reused across export batches and reconfiguration instead of being re-established
+_export_session = None
+
+
+def _get_export_session():
+    """Return the shared export session, creating it on first use."""
+    global _export_session
+
+    if _export_session is None:
+        # Imported on first use to keep requests out of the package import time
+        import requests
+
+        class _SharedSession(requests.Session):
+            def close(self):
+                # Exporters close their session on shutdown, including when a superseded
+                # provider is shut down, which would drop the connections of the exporter
+                # still in use. The session is closed at interpreter exit instead.
+                pass
+
+        _export_session = _SharedSession()
+        atexit.register(requests.Session.close, _export_session)
+
+    return _export_session
+
+
 def _create_exporter():
     """Create and return an OTLP HTTP span exporter.
 
@@ -125,19 +174,68 @@ def _create_exporter():
     kwargs = {
         "endpoint": endpoint,
         "headers": {"Authorization": f"Bearer {api_key}"},
+        # Span payloads are highly repetitive, so gzip shrinks each export request
+        "compression": Compression.Gzip,
+        "session": _get_export_session(),
     }
 
+    # The exporter pulls in protobuf and requests, so it is only imported once a tracer is
+    # actually created rather than when spyglass_ai is imported
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
     exporter = OTLPSpanExporter(**kwargs)
     return exporter
 
 
+def _get_bsp_setting(name):
+    """Read a positive integer batch span processor setting from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return _BSP_DEFAULTS[name]
+
+    try:
+        setting = int(value)
+    except ValueError:
+        setting = 0
+    if setting <= 0:
+        raise ExporterConfigurationError(f"{name} must be a positive integer, got {value!r}.")
+
+    return setting
+
+
+def _create_span_processor(exporter):
+    """Create a BatchSpanProcessor for the exporter, tuned for GenAI span volume."""
+    max_queue_size = _get_bsp_setting("SPYGLASS_OTEL_BSP_MAX_QUEUE_SIZE")
+    max_export_batch_size = _get_bsp_setting("SPYGLASS_OTEL_BSP_MAX_EXPORT_BATCH_SIZE")
+
+    # A batch can never be larger than the queue it is drained from
+    if max_export_batch_size > max_queue_size:
+        if os.getenv("SPYGLASS_OTEL_BSP_MAX_EXPORT_BATCH_SIZE") is not None:
+            raise ExporterConfigurationError(
+                "SPYGLASS_OTEL_BSP_MAX_EXPORT_BATCH_SIZE must not exceed "
+                f"SPYGLASS_OTEL_BSP_MAX_QUEUE_SIZE ({max_queue_size}), "
+                f"got {max_export_batch_size}."
+            )
+        # Only the queue size was lowered, so shrink the default batch size to fit it
+        max_export_batch_size = max_queue_size
+
+    return BatchSpanProcessor(
+        exporter,
+        max_queue_size=max_queue_size,
+        max_export_batch_size=max_export_batch_size,
+        schedule_delay_millis=_get_bsp_setting("SPYGLASS_OTEL_BSP_SCHEDULE_DELAY"),
+        export_timeout_millis=_get_bsp_setting("SPYGLASS_OTEL_BSP_EXPORT_TIMEOUT"),
+    )
+
+
 # Global variables for lazy initialization
 _spyglass_tracer = None
+_tracer_provider = None
 
 
 def get_spyglass_tracer():
     """Get the Spyglass tracer, initializing it if necessary."""
-    global _spyglass_tracer
+    global _spyglass_tracer, _tracer_provider
 
     if _spyglass_tracer is not None:
         return _spyglass_tracer
@@ -146,23 +244,40 @@ def get_spyglass_tracer():
     resource = _create_resource()
     provider = TracerProvider(resource=resource)
     exporter = _create_exporter()
-    processor = BatchSpanProcessor(exporter)
+    processor = _create_span_processor(exporter)
     provider.add_span_processor(processor)
 
-    # Sets the global default tracer provider
-    trace.set_tracer_provider(provider)
+    # The global tracer provider can only be set once; later attempts are ignored. Only
+    # register ours if no SDK provider is set yet (e.g. by the application or a previous
+    # configuration), so spans are never split across a provider that was never used.
+    if not isinstance(trace.get_tracer_provider(), TracerProvider):
+        trace.set_tracer_provider(provider)
 
-    # Create and cache the tracer
-    _spyglass_tracer = trace.get_tracer("spyglass-tracer")
+    # Stop the export thread of a provider from a previous configuration, unless it is
+    # the global provider that other instrumentation may still be using
+    previous_provider = _tracer_provider
+    if previous_provider is not None and previous_provider is not trace.get_tracer_provider():
+        previous_provider.shutdown()
+    _tracer_provider = provider
+
+    # Create and cache the tracer from our provider so spans always reach Spyglass
+    _spyglass_tracer = provider.get_tracer("spyglass-tracer")
 
     return _spyglass_tracer
 
 
 # For backward compatibility, create the tracer attribute that gets initialized lazily
 class _LazyTracer:
+    # Tracer attributes are cached on the instance once resolved, so later lookups such as
+    # spyglass_tracer.start_as_current_span bypass __getattr__ and the initialization check
     def __getattr__(self, name):
-        tracer = get_spyglass_tracer()
-        return getattr(tracer, name)
+        value = getattr(get_spyglass_tracer(), name)
+        self.__dict__[name] = value
+        return value
+
+    def _reset(self):
+        """Drop cached tracer attributes so they are resolved from a new tracer."""
+        self.__dict__.clear()
 
 
 spyglass_tracer = _LazyTracer()
@@ -0,0 +1,362 @@
+"""Semantic response cache for LLM calls."""
+
+import asyncio
+import contextlib
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from opentelemetry import trace
+
+try:
+    import numpy as np
+
+    _NUMPY_AVAILABLE = True
+except ImportError:
+    _NUMPY_AVAILABLE = False
+
+_NORMALIZE_RE = re.compile(r"\W+")
+
+# Initial number of rows allocated for the embedding matrix, doubled as it fills
+_INITIAL_CAPACITY = 64
+
+# Largest batch accepted by common embedding APIs (e.g. Vertex AI / Gemini allow 100 texts)
+_MAX_EMBEDDING_BATCH_SIZE = 100
+
+
+def _normalize_query(query: str) -> str:
+    """Lowercase a query and collapse punctuation/whitespace runs to single spaces."""
+    return _NORMALIZE_RE.sub(" ", query.lower()).strip()
+
+
+def _unit_vector(values: List[float]):
+    """Convert an embedding to a unit-length float32 vector."""
+    vector = np.asarray(values, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    if norm:
+        # Not in place: asarray returns the embedder's own array when it is already float32
+        vector = vector / norm
+    return vector
+
+
+class BatchingEmbedder:
+    """
+    Coalesces concurrent ``embed_query`` calls into batched ``embed_documents`` calls.
+
+    Each caller blocks until its batch is embedded. A background thread flushes a batch
+    once it holds ``batch_size`` texts or ``max_wait_ms`` after its first text arrived,
+    so concurrent lookups share one embedding API round trip.
+
+    Note that some providers embed documents and queries differently, so vectors from
+    this embedder should only be compared against vectors produced the same way.
+
+    Args:
+        embeddings: Any object exposing ``embed_documents(texts) -> List[List[float]]``
+        batch_size: Maximum texts per embedding request (at most 100)
+        max_wait_ms: Maximum time to wait for a batch to fill before flushing it
+    """
+
+    def __init__(self, embeddings: Any, batch_size: int = 16, max_wait_ms: float = 20):
+        if not 0 < batch_size <= _MAX_EMBEDDING_BATCH_SIZE:
+            raise ValueError(
+                f"batch_size must be between 1 and {_MAX_EMBEDDING_BATCH_SIZE}, got {batch_size}"
+            )
+
+        self.embeddings = embeddings
+        self.batch_size = batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single text as part of the next batch."""
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((text, future))
+        return future.result()
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Async version of embed_query() that awaits the batch without blocking a thread."""
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((text, future))
+        return await asyncio.wrap_future(future)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts directly; they are already a batch."""
+        return self.embeddings.embed_documents(texts)
+
+    def _ensure_worker(self) -> None:
+        """Start the background flush thread on first use."""
+        if self._worker is not None:
+            return
+
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="spyglass-embedding-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        """Collect queued texts into batches and embed them."""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait_ms / 1000
+
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self._flush(batch)
+            except Exception as e:
+                # Keep the worker alive so later lookups are still served; fail any caller
+                # whose future was left unresolved
+                for _, future in batch:
+                    with contextlib.suppress(InvalidStateError):
+                        if not future.done():
+                            future.set_exception(e)
+
+    def _flush(self, batch: List[Tuple[str, Future]]) -> None:
+        """Embed a batch and resolve each caller's future."""
+        # Claim each future so it can no longer be cancelled, dropping those whose caller
+        # already gave up (e.g. a cancelled aembed_query task)
+        batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        try:
+            vectors = self.embeddings.embed_documents([text for text, _ in batch])
+            if len(vectors) != len(batch):
+                raise ValueError(
+                    f"Expected {len(batch)} embeddings from embed_documents, got {len(vectors)}"
+                )
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), vector in zip(batch, vectors):
+            future.set_result(vector)
+
+
+class SemanticCache:
+    """
+    Two-level response cache that short-circuits repeated or near-duplicate LLM queries.
+
+    Level 1 is an exact-match dict keyed by the normalized query. Level 2 embeds the
+    query and compares it against every cached embedding with a single matrix-vector
+    product, returning the cached response when the best cosine similarity reaches
+    the threshold.
+
+    Cache lookups record ``spyglass.cache.*`` attributes on the current span.
+
+    Args:
+        embeddings: Any object exposing ``embed_query(text) -> List[float]``, such as a
+                    LangChain ``Embeddings`` instance
+        threshold: Minimum cosine similarity for a semantic hit (default 0.92)
+        batch_embeddings: Coalesce embeddings for concurrent lookups into batched
+                          requests using a BatchingEmbedder (default False)
+
+    Example:
+        ```python
+        from langchain_openai import OpenAIEmbeddings
+        from spyglass_ai import SemanticCache
+
+        cache = SemanticCache(OpenAIEmbeddings(), threshold=0.9)
+
+        answer = cache.get_or_compute(question, lambda: llm.invoke(question))
+        ```
+    """
+
+    def __init__(self, embeddings: Any, threshold: float = 0.92, batch_embeddings: bool = False):
+        if not _NUMPY_AVAILABLE:
+            raise ImportError(
+                "numpy is required for SemanticCache. "
+                "Install with: pip install spyglass-ai[semantic-cache]"
+            )
+
+        if batch_embeddings:
+            embeddings = BatchingEmbedder(embeddings)
+
+        self.embeddings = embeddings
+        self.threshold = threshold
+
+        # Normalized query -> row index into self._responses and self._matrix
+        self._exact = {}
+        self._responses: List[Any] = []
+        # Row-normalized embedding matrix; only the first len(self._responses) rows are used
+        self._matrix = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def get(self, query: str) -> Optional[Any]:
+        """Return the cached response for a query, or None on a miss."""
+        response, _ = self._lookup(query)
+        return response
+
+    async def aget(self, query: str) -> Optional[Any]:
+        """Async version of get() that does not block the event loop while embedding."""
+        response, _ = await self._alookup(query)
+        return response
+
+    def put(self, query: str, response: Any) -> None:
+        """Cache a response for a query."""
+        key = _normalize_query(query)
+        if not self._replace(key, response):
+            self._append(key, self._embed(key), response)
+
+    async def aput(self, query: str, response: Any) -> None:
+        """Async version of put()."""
+        key = _normalize_query(query)
+        if not self._replace(key, response):
+            self._append(key, await self._aembed(key), response)
+
+    def get_or_compute(self, query: str, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached response for a query, calling ``compute`` and caching its
+        result on a miss.
+        """
+        response, vector = self._lookup(query)
+        if response is not None:
+            return response
+
+        response = compute()
+        self._store(_normalize_query(query), vector, response)
+        return response
+
+    async def aget_or_compute(self, query: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async version of get_or_compute(), where ``compute`` returns an awaitable.
+
+        Concurrent lookups overlap their embedding requests instead of serializing them.
+        """
+        response, vector = await self._alookup(query)
+        if response is not None:
+            return response
+
+        response = await compute()
+        self._store(_normalize_query(query), vector, response)
+        return response
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._exact.clear()
+            self._responses.clear()
+            self._matrix = None
+
+    def _lookup(self, query: str) -> Tuple[Optional[Any], Optional[Any]]:
+        """Look a query up in both levels, returning (response, query_vector)."""
+        span = trace.get_current_span()
+        key = _normalize_query(query)
+
+        found, response = self._lookup_exact(span, key)
+        if found:
+            return response, None
+
+        vector = self._embed(key)
+        return self._lookup_semantic(span, vector), vector
+
+    async def _alookup(self, query: str) -> Tuple[Optional[Any], Optional[Any]]:
+        """Async version of _lookup()."""
+        span = trace.get_current_span()
+        key = _normalize_query(query)
+
+        found, response = self._lookup_exact(span, key)
+        if found:
+            return response, None
+
+        vector = await self._aembed(key)
+        return self._lookup_semantic(span, vector), vector
+
+    def _lookup_exact(self, span, key: str) -> Tuple[bool, Optional[Any]]:
+        """Look a normalized query up in the exact-match level."""
+        with self._lock:
+            index = self._exact.get(key)
+            if index is None:
+                return False, None
+            response = self._responses[index]
+
+        span.set_attribute("spyglass.cache.hit", True)
+        span.set_attribute("spyglass.cache.level", "exact")
+        return True, response
+
+    def _lookup_semantic(self, span, vector) -> Optional[Any]:
+        """Return the response of the most similar cached query above the threshold."""
+        with self._lock:
+            size = len(self._responses)
+            if size:
+                # Rows are pre-normalized, so one dot product yields every cosine similarity
+                similarities = np.dot(self._matrix[:size], vector)
+                best = int(np.argmax(similarities))
+                similarity = float(similarities[best])
+                if similarity >= self.threshold:
+                    span.set_attribute("spyglass.cache.hit", True)
+                    span.set_attribute("spyglass.cache.level", "semantic")
+                    span.set_attribute("spyglass.cache.similarity", similarity)
+                    return self._responses[best]
+
+        span.set_attribute("spyglass.cache.hit", False)
+        return None
+
+    def _embed(self, text: str):
+        """Embed text as a unit-length float32 vector."""
+        return _unit_vector(self.embeddings.embed_query(text))
+
+    async def _aembed(self, text: str):
+        """Embed text without blocking the event loop."""
+        if hasattr(self.embeddings, "aembed_query"):
+            return _unit_vector(await self.embeddings.aembed_query(text))
+        return _unit_vector(await asyncio.to_thread(self.embeddings.embed_query, text))
+
+    def _store(self, key: str, vector, response: Any) -> None:
+        """Cache a response whose query vector may already be known."""
+        if self._replace(key, response):
+            return
+        if vector is None:
+            vector = self._embed(key)
+        self._append(key, vector, response)
+
+    def _replace(self, key: str, response: Any) -> bool:
+        """Replace the response for an already cached query, returning whether it existed."""
+        with self._lock:
+            index = self._exact.get(key)
+            if index is None:
+                return False
+            self._responses[index] = response
+            return True
+
+    def _append(self, key: str, vector, response: Any) -> None:
+        """Add a new entry to both cache levels."""
+        with self._lock:
+            # A concurrent miss on the same query may have added it while this one embedded
+            index = self._exact.get(key)
+            if index is not None:
+                self._responses[index] = response
+                return
+
+            size = len(self._responses)
+            if self._matrix is None:
+                self._matrix = np.empty((_INITIAL_CAPACITY, vector.shape[0]), dtype=np.float32)
+            elif size == self._matrix.shape[0]:
+                grown = np.empty((size * 2, self._matrix.shape[1]), dtype=np.float32)
+                grown[:size] = self._matrix
+                self._matrix = grown
+
+            self._matrix[size] = vector
+            self._responses.append(response)
+            self._exact[key] = size
@@ -1,3 +1,6 @@
+from concurrent.futures import Future
+from unittest.mock import patch
+
 import pytest
 from opentelemetry import trace
 
@@ -10,3 +13,19 @@ def cleanup_otel():
     tracer_provider = trace.get_tracer_provider()
     if hasattr(tracer_provider, "shutdown"):
         tracer_provider.shutdown()
+
+
+class _InlineExecutor:
+    """Executor that runs submitted work immediately in the calling thread."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+@pytest.fixture(autouse=True)
+def inline_span_enrichment():
+    """Enrich spans synchronously so tests can inspect attributes right after a call."""
+    with patch("spyglass_ai.enrich._ENRICH_POOL", _InlineExecutor()):
+        yield
@@ -0,0 +1,168 @@
+import json
+import os
+import subprocess
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+
+from spyglass_ai.attributes import (
+    _env_choice,
+    _env_flag,
+    _env_int,
+    content_length,
+    dumps,
+    set_bounded_attribute,
+    truncate,
+)
+
+
+class TestAttributes:
+    """Test suite for span attribute serialization helpers"""
+
+    @pytest.mark.parametrize("orjson_available", [True, False])
+    def test_dumps_round_trips(self, orjson_available):
+        """Test that dumps produces equivalent JSON with and without orjson"""
+        if orjson_available:
+            pytest.importorskip("orjson")
+        value = [{"role": "user", "content": "Hello", "tool_calls": [{"args": {"x": 1}}]}]
+
+        with patch("spyglass_ai.attributes._ORJSON_AVAILABLE", orjson_available):
+            assert json.loads(dumps(value)) == value
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [(None, True), ("1", True), ("true", True), ("false", False), ("0", False), ("OFF", False)],
+    )
+    def test_env_flag(self, value, expected):
+        """Test boolean env flag parsing"""
+        env = {} if value is None else {"SPYGLASS_TEST_FLAG": value}
+        with patch.dict(os.environ, env, clear=True):
+            assert _env_flag("SPYGLASS_TEST_FLAG", True) is expected
+
+    @pytest.mark.parametrize("value", ["maybe", ""])
+    def test_env_flag_invalid(self, value, caplog):
+        """Test that unrecognized boolean env values log a warning and use the default"""
+        with patch.dict(os.environ, {"SPYGLASS_TEST_FLAG": value}, clear=True):
+            assert _env_flag("SPYGLASS_TEST_FLAG", True) is True
+
+        assert "SPYGLASS_TEST_FLAG must be true or false" in caplog.text
+
+    @pytest.mark.parametrize("value,expected", [(None, 8192), ("1024", 1024), ("0", 0)])
+    def test_env_int(self, value, expected):
+        """Test integer env setting parsing"""
+        env = {} if value is None else {"SPYGLASS_TEST_BYTES": value}
+        with patch.dict(os.environ, env, clear=True):
+            assert _env_int("SPYGLASS_TEST_BYTES", 8192) == expected
+
+    @pytest.mark.parametrize("value", ["lots", "-1", "1.5"])
+    def test_env_int_invalid(self, value, caplog):
+        """Test that invalid integer env values log a warning and use the default"""
+        with patch.dict(os.environ, {"SPYGLASS_TEST_BYTES": value}, clear=True):
+            assert _env_int("SPYGLASS_TEST_BYTES", 8192) == 8192
+
+        assert "SPYGLASS_TEST_BYTES must be a non-negative integer" in caplog.text
+
+    @pytest.mark.parametrize(
+        "value,expected", [(None, "full"), ("minimal", "minimal"), (" OFF ", "off")]
+    )
+    def test_env_choice(self, value, expected):
+        """Test choice env setting parsing"""
+        env = {} if value is None else {"SPYGLASS_TEST_LEVEL": value}
+        with patch.dict(os.environ, env, clear=True):
+            assert _env_choice("SPYGLASS_TEST_LEVEL", ("off", "minimal", "full"), "full") == (
+                expected
+            )
+
+    def test_env_choice_invalid(self, caplog):
+        """Test that unknown choice env values log a warning and use the default"""
+        with patch.dict(os.environ, {"SPYGLASS_TEST_LEVEL": "verbose"}, clear=True):
+            assert _env_choice("SPYGLASS_TEST_LEVEL", ("off", "minimal", "full"), "full") == "full"
+
+        assert "SPYGLASS_TEST_LEVEL must be one of off, minimal, full" in caplog.text
+
+    def test_invalid_settings_do_not_break_import(self):
+        """Test that spyglass_ai still imports when trace settings are invalid"""
+        env = {
+            **os.environ,
+            "SPYGLASS_TRACE_LEVEL": "verbose",
+            "SPYGLASS_TRACE_MESSAGE_BODIES": "maybe",
+            "SPYGLASS_MAX_ATTR_BYTES": "lots",
+        }
+        code = (
+            "from spyglass_ai import attributes; "
+            "print(attributes.TRACE_LEVEL, attributes.MESSAGE_BODIES_ENABLED, "
+            "attributes.MAX_ATTR_BYTES)"
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.split() == ["full", "True", "8192"]
+
+    def test_content_length(self):
+        """Test that content length counts text across dict and object messages"""
+        message = Mock(spec=["content"])
+        message.content = [{"type": "text", "text": "abc"}, {"type": "image_url"}, "de"]
+
+        messages = [{"role": "user", "content": "Hello"}, message, {"role": "tool"}, None]
+
+        assert content_length(messages) == 10
+
+    def test_truncate_short_value_unchanged(self):
+        """Test that values within the limit are returned as is"""
+        assert truncate("short", 100) == ("short", 0)
+        assert truncate("x" * 200, 0) == ("x" * 200, 0)
+
+    def test_truncate_keeps_head_and_tail(self):
+        """Test that long values keep their head and tail around a marker"""
+        value = "x" * 500 + "y" * 500
+
+        truncated, removed = truncate(value, 100)
+
+        assert len(truncated.encode("utf-8")) <= 100
+        assert truncated.startswith("x")
+        assert truncated.endswith("y")
+        head, _, tail = truncated.partition(f"...truncated {removed} bytes...")
+        assert len(head) + len(tail) == 1000 - removed
+
+    def test_truncate_multibyte_characters(self):
+        """Test that truncation never produces partial UTF-8 characters"""
+        truncated, removed = truncate("é" * 1000, 101)
+
+        assert removed > 0
+        assert len(truncated.encode("utf-8")) <= 101
+        assert "\ufffd" not in truncated
+
+    @pytest.mark.parametrize("max_bytes", [1, 5, 20])
+    def test_truncate_limit_smaller_than_marker(self, max_bytes):
+        """Test that limits too small for the marker still bound the result"""
+        truncated, removed = truncate("é" * 1000, max_bytes)
+
+        assert len(truncated.encode("utf-8")) <= max_bytes
+        assert removed == 2000 - len(truncated.encode("utf-8"))
+        assert "\ufffd" not in truncated
+
+    def test_set_bounded_attribute_records_truncated_bytes(self):
+        """Test that truncated attributes also record how many bytes were dropped"""
+        span = Mock()
+
+        with patch("spyglass_ai.attributes.MAX_ATTR_BYTES", 64):
+            set_bounded_attribute(span, "gen_ai.input.messages", "x" * 1000)
+
+        key, value = span.set_attribute.call_args_list[0][0]
+        assert key == "gen_ai.input.messages"
+        assert len(value) <= 64
+        assert value.count("x") == 1000 - span.set_attribute.call_args_list[1][0][1]
+        assert span.set_attribute.call_args_list[1][0][0] == (
+            "gen_ai.input.messages.truncated_bytes"
+        )
+
+    def test_set_bounded_attribute_within_limit(self):
+        """Test that short attributes are set without a truncated_bytes attribute"""
+        span = Mock()
+
+        set_bounded_attribute(span, "gen_ai.input.messages", "[]")
+
+        span.set_attribute.assert_called_once_with("gen_ai.input.messages", "[]")
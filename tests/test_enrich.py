@@ -0,0 +1,78 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import StatusCode
+
+from spyglass_ai.enrich import _ENRICH_POOL, _finish_span, finish_span
+
+
+class TestFinishSpan:
+    """Test suite for background span enrichment"""
+
+    def test_enriches_and_ends_span_in_background(self):
+        """Test that enrichment runs off the calling thread and ends the span"""
+        span = Mock()
+        ended = threading.Event()
+        span.end.side_effect = lambda **kwargs: ended.set()
+        threads = []
+
+        def enrich(span, value):
+            threads.append(threading.current_thread().name)
+            span.set_attribute("gen_ai.request.model", value)
+
+        # Bypass the inline executor installed by conftest
+        _ENRICH_POOL.submit(_finish_span, span, enrich, ("gpt-4",)).result(timeout=5)
+
+        assert ended.is_set()
+        assert threads[0].startswith("spyglass-enrich")
+        span.set_attribute.assert_called_once_with("gen_ai.request.model", "gpt-4")
+        assert span.set_status.call_args[0][0].status_code == StatusCode.OK
+
+    def test_capture_error_still_ends_span(self):
+        """Test that a failing enrichment is flagged without breaking the span"""
+        span = Mock()
+
+        def enrich(span):
+            raise ValueError("unserializable")
+
+        finish_span(span, enrich)
+
+        span.set_attribute.assert_called_once_with("spyglass.enrich.capture_error", True)
+        assert span.set_status.call_args[0][0].status_code == StatusCode.OK
+        span.end.assert_called_once()
+
+    def test_non_recording_span_skipped(self):
+        """Test that spans that are not recording are not enriched"""
+        span = Mock()
+        span.is_recording.return_value = False
+        enrich = Mock()
+
+        finish_span(span, enrich)
+
+        enrich.assert_not_called()
+        span.end.assert_not_called()
+
+    def test_span_duration_excludes_enrichment(self):
+        """Test that queueing and formatting time on the pool are not part of the span"""
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        span = provider.get_tracer("test").start_span("llm.call")
+
+        def slow_enrich(span):
+            time.sleep(0.3)
+            span.set_attribute("gen_ai.request.model", "gpt-4")
+
+        # Use a real pool rather than the inline executor installed by conftest
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            with patch("spyglass_ai.enrich._ENRICH_POOL", pool):
+                finish_span(span, slow_enrich)
+
+        (exported,) = exporter.get_finished_spans()
+        assert exported.attributes["gen_ai.request.model"] == "gpt-4"
+        assert exported.end_time - exported.start_time < 100_000_000
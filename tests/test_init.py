@@ -0,0 +1,36 @@
+import subprocess
+import sys
+
+import pytest
+
+import spyglass_ai
+
+
+class TestLazyImports:
+    """Test suite for lazily imported package exports"""
+
+    def test_import_does_not_load_optional_dependencies(self):
+        """Test that importing spyglass_ai leaves heavy optional modules unloaded"""
+        code = (
+            "import sys, spyglass_ai; "
+            "print(','.join(m for m in ('langchain_core', 'numpy', 'requests') "
+            "if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.strip() == ""
+
+    def test_lazy_export_resolves_on_access(self):
+        """Test that optional integrations are importable from the package"""
+        from spyglass_ai.langchain_openai import spyglass_chatopenai
+
+        assert spyglass_ai.spyglass_chatopenai is spyglass_chatopenai
+        assert "spyglass_chatopenai" in dir(spyglass_ai)
+        assert set(spyglass_ai.__all__) >= {"spyglass_chatopenai", "SemanticCache"}
+
+    def test_unknown_attribute(self):
+        """Test that unknown names raise AttributeError"""
+        with pytest.raises(AttributeError, match="has no attribute 'missing'"):
+            spyglass_ai.missing
@@ -4,7 +4,6 @@ import pytest
 from opentelemetry.trace import Status, StatusCode
 
 from spyglass_ai.langchain_aws import (
-    _format_langchain_messages,
     _set_bedrock_attributes,
     _set_response_attributes,
     spyglass_chatbedrockconverse,
@@ -62,7 +61,15 @@ class TestSpyglassChatBedrockConverse:
         # Verify methods are wrapped (different from originals)
         assert mock_llm._generate is not original_generate
 
-    @patch("spyglass_ai.langchain_aws.json.dumps")
+    def test_spyglass_chatbedrockconverse_does_not_double_wrap(self, mock_llm):
+        """Test that wrapping an already wrapped instance is a no-op"""
+        wrapped_llm = spyglass_chatbedrockconverse(mock_llm)
+        traced_generate = wrapped_llm._generate
+
+        assert spyglass_chatbedrockconverse(wrapped_llm) is wrapped_llm
+        assert wrapped_llm._generate is traced_generate
+
+    @patch("spyglass_ai.langchain_messages.dumps")
     @patch("spyglass_ai.langchain_aws.spyglass_tracer")
     def test_generate_method_tracing(self, mock_tracer, mock_json_dumps, mock_llm, mock_messages):
         """Test that _generate method is properly traced"""
@@ -90,8 +97,12 @@ class TestSpyglassChatBedrockConverse:
 
         # Verify tracing
         mock_tracer.start_as_current_span.assert_called_with(
-            "bedrock.chat.generate", record_exception=False
+            "bedrock.chat.generate",
+            record_exception=False,
+            set_status_on_exception=False,
+            end_on_exit=False,
         )
+        mock_span.end.assert_called_once()
         # Check that set_status was called with OK status (don't check exact object)
         assert mock_span.set_status.called
         status_call = mock_span.set_status.call_args[0][0]
@@ -101,7 +112,7 @@ class TestSpyglassChatBedrockConverse:
         # Instead, verify the result is correct
         assert result is mock_result
 
-    @patch("spyglass_ai.langchain_aws.json.dumps")
+    @patch("spyglass_ai.langchain_messages.dumps")
     @patch("spyglass_ai.langchain_aws.spyglass_tracer")
     def test_generate_method_exception_handling(
         self, mock_tracer, mock_json_dumps, mock_llm, mock_messages
@@ -130,7 +141,7 @@ class TestSpyglassChatBedrockConverse:
         assert status_call.status_code == StatusCode.ERROR
         assert "Test error" in str(status_call.description)
 
-    @patch("spyglass_ai.langchain_aws.json.dumps")
+    @patch("spyglass_ai.langchain_messages.dumps")
     def test_set_bedrock_attributes(self, mock_json_dumps, mock_span, mock_llm, mock_messages):
         """Test _set_bedrock_attributes function"""
         mock_json_dumps.return_value = '{"messages": "mocked"}'
@@ -160,7 +171,7 @@ class TestSpyglassChatBedrockConverse:
             "gen_ai.request.tools.names", "get_weather,get_population"
         )
 
-    @patch("spyglass_ai.langchain_aws.json.dumps")
+    @patch("spyglass_ai.langchain_messages.dumps")
     def test_set_bedrock_attributes_with_guardrails(
         self, mock_json_dumps, mock_span, mock_llm, mock_messages
     ):
@@ -176,7 +187,69 @@ class TestSpyglassChatBedrockConverse:
             "gen_ai.request.aws.performance_config.enabled", True
         )
 
-    @patch("spyglass_ai.langchain_aws.json.dumps")
+    def test_attributes_skipped_for_non_recording_span(self, mock_span, mock_llm, mock_messages):
+        """Test that no attributes are built for spans that are not recording"""
+        mock_span.is_recording.return_value = False
+
+        _set_bedrock_attributes(mock_span, mock_llm, mock_messages, {})
+        _set_response_attributes(mock_span, Mock())
+
+        mock_span.set_attribute.assert_not_called()
+
+    @patch("spyglass_ai.langchain_aws.TRACE_LEVEL", "minimal")
+    def test_minimal_trace_level(self, mock_span, mock_llm, mock_messages):
+        """Test that the minimal trace level records only system, model and token counts"""
+        mock_message = Mock()
+        mock_message.usage_metadata = {"input_tokens": 100, "output_tokens": 50}
+        mock_message.tool_calls = [{"name": "get_weather", "id": "call_1"}]
+        mock_result = Mock()
+        mock_result.generations = [Mock(message=mock_message)]
+
+        _set_bedrock_attributes(mock_span, mock_llm, mock_messages, {})
+        _set_response_attributes(mock_span, mock_result)
+
+        recorded = [call[0][0] for call in mock_span.set_attribute.call_args_list]
+        assert recorded == [
+            "gen_ai.system",
+            "gen_ai.request.model",
+            "gen_ai.usage.input_tokens",
+            "gen_ai.usage.output_tokens",
+        ]
+
+    @patch("spyglass_ai.langchain_aws.TRACE_LEVEL", "off")
+    def test_trace_level_off(self, mock_span, mock_llm, mock_messages):
+        """Test that no GenAI attributes are recorded when tracing detail is off"""
+        _set_bedrock_attributes(mock_span, mock_llm, mock_messages, {})
+        _set_response_attributes(mock_span, Mock())
+
+        mock_span.set_attribute.assert_not_called()
+
+    def test_request_attributes_snapshotted_on_wrap(self, mock_llm):
+        """Test that configuration attributes are snapshotted when wrapping"""
+        mock_llm.guardrail_config = {"guardrailId": "test-guardrail"}
+
+        spyglass_chatbedrockconverse(mock_llm)
+
+        assert mock_llm.__spyglass_attrs__ == (
+            ("gen_ai.operation.name", "chat"),
+            ("gen_ai.system", "aws_bedrock"),
+            ("gen_ai.request.model", "anthropic.claude-3-sonnet-20240229-v1:0"),
+            ("gen_ai.request.aws.region", "us-west-2"),
+            ("gen_ai.request.aws.provider", "anthropic"),
+            ("gen_ai.request.aws.guardrails.enabled", True),
+        )
+
+    def test_parameters_read_per_call(self, mock_span, mock_llm, mock_messages):
+        """Test that sampling parameters changed after wrapping are recorded"""
+        spyglass_chatbedrockconverse(mock_llm)
+        mock_llm.temperature = 0.7
+
+        with patch("spyglass_ai.langchain_messages.dumps"):
+            _set_bedrock_attributes(mock_span, mock_llm, mock_messages, {})
+
+        mock_span.set_attribute.assert_any_call("gen_ai.request.temperature", 0.7)
+
+    @patch("spyglass_ai.langchain_messages.dumps")
     def test_set_response_attributes(self, mock_json_dumps, mock_span):
         """Test _set_response_attributes function"""
         mock_json_dumps.return_value = '{"messages": "mocked"}'
@@ -223,7 +296,7 @@ class TestSpyglassChatBedrockConverse:
         mock_span.set_attribute.assert_any_call("gen_ai.response.finish_reasons", "end_turn")
         mock_span.set_attribute.assert_any_call("gen_ai.response.aws.latency_ms", 1500)
 
-    @patch("spyglass_ai.langchain_aws.json.dumps")
+    @patch("spyglass_ai.langchain_messages.dumps")
     def test_latency_handling_list_format(self, mock_json_dumps, mock_span):
         """Test handling of latency in list format"""
         mock_json_dumps.return_value = '{"messages": "mocked"}'
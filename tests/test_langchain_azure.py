@@ -50,7 +50,15 @@ class TestSpyglassAzureChatOpenAI:
         assert mock_llm._generate is not original_generate
         assert mock_llm._agenerate is not original_agenerate
 
-    @patch("spyglass_ai.langchain_azure.json.dumps")
+    def test_spyglass_azure_chatopenai_does_not_double_wrap(self, mock_llm):
+        """Test that wrapping an already wrapped instance is a no-op"""
+        wrapped_llm = spyglass_azure_chatopenai(mock_llm)
+        traced_generate = wrapped_llm._generate
+
+        assert spyglass_azure_chatopenai(wrapped_llm) is wrapped_llm
+        assert wrapped_llm._generate is traced_generate
+
+    @patch("spyglass_ai.langchain_messages.dumps")
     @patch("spyglass_ai.langchain_azure.spyglass_tracer")
     def test_generate_method_tracing(self, mock_tracer, mock_json_dumps, mock_llm, mock_messages):
         """Test that _generate method is properly traced"""
@@ -78,8 +86,12 @@ class TestSpyglassAzureChatOpenAI:
 
         # Verify tracing
         mock_tracer.start_as_current_span.assert_called_with(
-            "azure.openai.chat.generate", record_exception=False
+            "azure.openai.chat.generate",
+            record_exception=False,
+            set_status_on_exception=False,
+            end_on_exit=False,
         )
+        mock_span.end.assert_called_once()
         # Check that set_status was called with OK status
         assert mock_span.set_status.called
         status_call = mock_span.set_status.call_args[0][0]
@@ -100,7 +112,7 @@ class TestSpyglassAzureChatOpenAI:
         # Verify original method was called
         assert result is mock_result
 
-    @patch("spyglass_ai.langchain_azure.json.dumps")
+    @patch("spyglass_ai.langchain_messages.dumps")
     @patch("spyglass_ai.langchain_azure.spyglass_tracer")
     def test_generate_method_exception_handling(
         self, mock_tracer, mock_json_dumps, mock_llm, mock_messages
@@ -129,7 +141,7 @@ class TestSpyglassAzureChatOpenAI:
         assert status_call.status_code == StatusCode.ERROR
         assert "Test error" in str(status_call.description)
 
-    @patch("spyglass_ai.langchain_azure.json.dumps")
+    @patch("spyglass_ai.langchain_messages.dumps")
     @patch("spyglass_ai.langchain_azure.spyglass_tracer")
     @pytest.mark.asyncio
     async def test_agenerate_method_tracing(
@@ -160,8 +172,12 @@ class TestSpyglassAzureChatOpenAI:
 
         # Verify tracing
         mock_tracer.start_as_current_span.assert_called_with(
-            "azure.openai.chat.agenerate", record_exception=False
+            "azure.openai.chat.agenerate",
+            record_exception=False,
+            set_status_on_exception=False,
+            end_on_exit=False,
         )
+        mock_span.end.assert_called_once()
         # Check that set_status was called with OK status
         assert mock_span.set_status.called
         status_call = mock_span.set_status.call_args[0][0]
@@ -186,3 +202,34 @@ class TestSpyglassAzureChatOpenAI:
         # Should not raise an error
         wrapped_llm = spyglass_azure_chatopenai(llm)
         assert wrapped_llm is llm
+
+    def test_request_attributes_snapshotted_on_wrap(self, mock_llm):
+        """Test that configuration attributes are collected once when wrapping"""
+        from spyglass_ai.langchain_azure import _set_azure_openai_attributes
+
+        spyglass_azure_chatopenai(mock_llm)
+
+        assert ("gen_ai.system", "azure") in mock_llm.__spyglass_attrs__
+        assert ("gen_ai.request.deployment_name", "my-deployment") in mock_llm.__spyglass_attrs__
+
+        # The snapshot is reused rather than probing the instance on every call
+        mock_llm.__spyglass_attrs__ = (("gen_ai.request.model", "snapshot-model"),)
+        mock_span = Mock()
+        _set_azure_openai_attributes(mock_span, mock_llm, [], {})
+
+        mock_span.set_attribute.assert_any_call("gen_ai.request.model", "snapshot-model")
+        set_attribute_keys = [call[0][0] for call in mock_span.set_attribute.call_args_list]
+        assert "gen_ai.request.deployment_name" not in set_attribute_keys
+
+    def test_parameters_read_per_call(self, mock_llm):
+        """Test that sampling parameters changed after wrapping are recorded"""
+        from spyglass_ai.langchain_azure import _set_azure_openai_attributes
+
+        spyglass_azure_chatopenai(mock_llm)
+        assert all(key != "gen_ai.request.temperature" for key, _ in mock_llm.__spyglass_attrs__)
+        mock_llm.temperature = 0.2
+        mock_span = Mock()
+
+        _set_azure_openai_attributes(mock_span, mock_llm, [], {})
+
+        mock_span.set_attribute.assert_any_call("gen_ai.request.temperature", 0.2)
@@ -0,0 +1,194 @@
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from spyglass_ai.langchain_messages import (
+    _load_role_map,
+    _message_role,
+    _resolve_role,
+    _role_from_class_name,
+    format_langchain_messages,
+    set_langchain_messages_attribute,
+    snapshot_langchain_response,
+)
+
+
+class TestFormatLangchainMessages:
+    """Test suite for shared LangChain message formatting"""
+
+    @pytest.mark.parametrize(
+        "class_name,expected_role",
+        [
+            ("HumanMessage", "user"),
+            ("HumanMessageChunk", "user"),
+            ("UserMessage", "user"),
+            ("AIMessage", "assistant"),
+            ("AIMessageChunk", "assistant"),
+            ("AssistantMessage", "assistant"),
+            ("SystemMessage", "system"),
+            ("ToolMessage", "tool"),
+            ("ChatMessage", "unknown"),
+        ],
+    )
+    def test_role_from_class_name(self, class_name, expected_role):
+        """Test that message class names map to GenAI roles"""
+        assert _role_from_class_name(class_name) == expected_role
+
+    def test_role_from_message_class(self):
+        """Test that LangChain message classes and subclasses map to GenAI roles"""
+        messages = pytest.importorskip("langchain_core.messages")
+
+        assert _message_role(messages.HumanMessage(content="hi")) == "user"
+        assert _message_role(messages.AIMessageChunk(content="hi")) == "assistant"
+        assert _message_role(messages.SystemMessage(content="hi")) == "system"
+        assert _message_role(messages.ToolMessage(content="hi", tool_call_id="1")) == "tool"
+        assert _message_role(messages.ChatMessage(content="hi", role="critic")) == "unknown"
+
+    def test_role_falls_back_to_class_name(self):
+        """Test that classes outside the LangChain hierarchy resolve by name"""
+
+        class CustomAssistantMessage:
+            content = "hi"
+
+        _load_role_map()
+        with patch.dict("spyglass_ai.langchain_messages._ROLE_MAP", clear=True):
+            _resolve_role.cache_clear()
+            assert _message_role(CustomAssistantMessage()) == "assistant"
+        _resolve_role.cache_clear()
+
+    def test_format_messages(self):
+        """Test formatting of text, multi-part and tool call messages"""
+        human = Mock(spec=["content"])
+        human.__class__.__name__ = "HumanMessage"
+        human.content = [{"type": "text", "text": "Hello"}, {"type": "image_url"}, "there"]
+
+        ai = Mock(spec=["content", "tool_calls"])
+        ai.__class__.__name__ = "AIMessage"
+        ai.content = ""
+        ai.tool_calls = [{"id": "call_1", "name": "get_weather", "args": {"city": "Paris"}}]
+
+        tool = Mock(spec=["content", "tool_call_id"])
+        tool.__class__.__name__ = "ToolMessage"
+        tool.content = "Sunny"
+        tool.tool_call_id = "call_1"
+
+        formatted = format_langchain_messages([human, ai, tool])
+
+        assert formatted[0] == {"role": "user", "content": "Hello there"}
+        assert formatted[1]["role"] == "assistant"
+        (tool_call,) = formatted[1]["tool_calls"]
+        assert tool_call["id"] == "call_1"
+        assert tool_call["type"] == "function"
+        assert tool_call["function"]["name"] == "get_weather"
+        # Arguments are a JSON string, matching spans from spyglass_openai
+        assert json.loads(tool_call["function"]["arguments"]) == {"city": "Paris"}
+        assert formatted[2] == {"role": "tool", "content": "Sunny", "tool_call_id": "call_1"}
+
+    def test_format_keeps_null_tool_call_id(self):
+        """Test that a tool_call_id attribute set to None is still recorded"""
+        tool = Mock(spec=["content", "tool_call_id"])
+        tool.__class__.__name__ = "ToolMessage"
+        tool.content = "Sunny"
+        tool.tool_call_id = None
+
+        formatted = format_langchain_messages([tool])
+
+        assert formatted[0] == {"role": "tool", "content": "Sunny", "tool_call_id": None}
+
+    def test_format_langchain_core_messages(self):
+        """Test formatting of real LangChain messages in a single pass"""
+        messages = pytest.importorskip("langchain_core.messages")
+
+        formatted = format_langchain_messages(
+            [
+                messages.SystemMessage(content="Be brief"),
+                messages.HumanMessage(content=[{"type": "text", "text": "Hi"}, "there"]),
+                messages.AIMessage(
+                    content="",
+                    tool_calls=[{"id": "call_1", "name": "get_weather", "args": {}}],
+                ),
+                messages.ToolMessage(content="Sunny", tool_call_id="call_1"),
+            ]
+        )
+
+        assert formatted == [
+            {"role": "system", "content": "Be brief"},
+            {"role": "user", "content": "Hi there"},
+            {
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [
+                    {
+                        "id": "call_1",
+                        "type": "function",
+                        "function": {"name": "get_weather", "arguments": ""},
+                    }
+                ],
+            },
+            {"role": "tool", "content": "Sunny", "tool_call_id": "call_1"},
+        ]
+
+    def test_set_attribute_skips_non_recording_span(self):
+        """Test that messages are not formatted for spans that are not recording"""
+        span = Mock()
+        span.is_recording.return_value = False
+
+        with patch("spyglass_ai.langchain_messages.format_langchain_messages") as mock_format:
+            set_langchain_messages_attribute(span, "gen_ai.input.messages", [Mock()])
+
+        mock_format.assert_not_called()
+        span.set_attribute.assert_not_called()
+
+    def test_set_attribute_records_json(self):
+        """Test that messages are recorded as GenAI JSON"""
+        span = Mock()
+        message = Mock(spec=["content"])
+        message.__class__.__name__ = "HumanMessage"
+        message.content = "Hello"
+
+        set_langchain_messages_attribute(span, "gen_ai.input.messages", [message])
+
+        key, value = span.set_attribute.call_args[0]
+        assert key == "gen_ai.input.messages"
+        assert json.loads(value) == [{"role": "user", "content": "Hello"}]
+
+    def test_set_attribute_without_message_bodies(self):
+        """Test that only the content length is recorded when bodies are disabled"""
+        span = Mock()
+        message = Mock(spec=["content"])
+        message.content = "Hello"
+
+        with patch("spyglass_ai.langchain_messages.MESSAGE_BODIES_ENABLED", False):
+            set_langchain_messages_attribute(span, "gen_ai.input.messages", [message, message])
+
+        span.set_attribute.assert_called_once_with("gen_ai.input.messages.content_length", 10)
+
+
+class TestSnapshotLangchainResponse:
+    """Test suite for capturing LangChain responses before background enrichment"""
+
+    def test_snapshot_keeps_original_references(self):
+        """Test that later reassignments on the result do not affect the snapshot"""
+        message = Mock()
+        message.usage_metadata = {"total_tokens": 7}
+        message.response_metadata = {"model_name": "gpt-4"}
+        result = Mock()
+        result.generations = [Mock(message=message)]
+        result.llm_output = {"token_usage": {}}
+
+        response = snapshot_langchain_response(result)
+        message.response_metadata = {"model_name": "replaced"}
+        result.generations[0].message = Mock()
+
+        assert response.message is message
+        assert response.usage_metadata == {"total_tokens": 7}
+        assert response.response_metadata == {"model_name": "gpt-4"}
+        assert response.llm_output == {"token_usage": {}}
+
+    def test_snapshot_without_generations(self):
+        """Test that results without generations produce no snapshot"""
+        result = Mock()
+        result.generations = []
+
+        assert snapshot_langchain_response(result) is None
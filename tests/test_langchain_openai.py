@@ -1,6 +1,10 @@
+import asyncio
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
 from opentelemetry.trace import Status, StatusCode
 
 from spyglass_ai.langchain_openai import spyglass_chatopenai
@@ -47,7 +51,15 @@ class TestSpyglassChatOpenAI:
         assert mock_llm._generate is not original_generate
         assert mock_llm._agenerate is not original_agenerate
 
-    @patch("spyglass_ai.langchain_openai.json.dumps")
+    def test_spyglass_chatopenai_does_not_double_wrap(self, mock_llm):
+        """Test that wrapping an already wrapped instance is a no-op"""
+        wrapped_llm = spyglass_chatopenai(mock_llm)
+        traced_generate = wrapped_llm._generate
+
+        assert spyglass_chatopenai(wrapped_llm) is wrapped_llm
+        assert wrapped_llm._generate is traced_generate
+
+    @patch("spyglass_ai.langchain_messages.dumps")
     @patch("spyglass_ai.langchain_openai.spyglass_tracer")
     def test_generate_method_tracing(self, mock_tracer, mock_json_dumps, mock_llm, mock_messages):
         """Test that _generate method is properly traced"""
@@ -75,8 +87,12 @@ class TestSpyglassChatOpenAI:
 
         # Verify tracing
         mock_tracer.start_as_current_span.assert_called_with(
-            "openai.chat.generate", record_exception=False
+            "openai.chat.generate",
+            record_exception=False,
+            set_status_on_exception=False,
+            end_on_exit=False,
         )
+        mock_span.end.assert_called_once()
         # Check that set_status was called with OK status
         assert mock_span.set_status.called
         status_call = mock_span.set_status.call_args[0][0]
@@ -85,7 +101,7 @@ class TestSpyglassChatOpenAI:
         # Verify original method was called
         assert result is mock_result
 
-    @patch("spyglass_ai.langchain_openai.json.dumps")
+    @patch("spyglass_ai.langchain_messages.dumps")
     @patch("spyglass_ai.langchain_openai.spyglass_tracer")
     def test_generate_method_exception_handling(
         self, mock_tracer, mock_json_dumps, mock_llm, mock_messages
@@ -108,13 +124,14 @@ class TestSpyglassChatOpenAI:
 
         # Verify exception was recorded
         mock_span.record_exception.assert_called_once_with(test_exception)
+        mock_span.end.assert_called_once()
         # Check that set_status was called with ERROR status
         assert mock_span.set_status.called
         status_call = mock_span.set_status.call_args[0][0]
         assert status_call.status_code == StatusCode.ERROR
         assert "Test error" in str(status_call.description)
 
-    @patch("spyglass_ai.langchain_openai.json.dumps")
+    @patch("spyglass_ai.langchain_messages.dumps")
     @patch("spyglass_ai.langchain_openai.spyglass_tracer")
     @pytest.mark.asyncio
     async def test_agenerate_method_tracing(
@@ -145,8 +162,12 @@ class TestSpyglassChatOpenAI:
 
         # Verify tracing
         mock_tracer.start_as_current_span.assert_called_with(
-            "openai.chat.agenerate", record_exception=False
+            "openai.chat.agenerate",
+            record_exception=False,
+            set_status_on_exception=False,
+            end_on_exit=False,
         )
+        mock_span.end.assert_called_once()
         # Check that set_status was called with OK status
         assert mock_span.set_status.called
         status_call = mock_span.set_status.call_args[0][0]
@@ -154,3 +175,99 @@ class TestSpyglassChatOpenAI:
 
         # Verify original method was called
         assert result is mock_result
+
+    @pytest.mark.asyncio
+    async def test_cancelled_agenerate_ends_span(self, mock_llm, mock_messages):
+        """Test that a cancelled call still ends and exports its span"""
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        mock_llm._agenerate = AsyncMock(side_effect=asyncio.CancelledError())
+
+        with patch("spyglass_ai.langchain_openai.spyglass_tracer", provider.get_tracer("test")):
+            wrapped_llm = spyglass_chatopenai(mock_llm)
+            with pytest.raises(asyncio.CancelledError):
+                await wrapped_llm._agenerate(mock_messages)
+
+        (span,) = exporter.get_finished_spans()
+        assert span.name == "openai.chat.agenerate"
+        assert span.status.status_code == StatusCode.ERROR
+
+    @patch("spyglass_ai.langchain_openai._set_openai_attributes")
+    @patch("spyglass_ai.langchain_openai.spyglass_tracer")
+    def test_error_path_ends_span_when_attributes_fail(
+        self, mock_tracer, mock_set_attributes, mock_llm, mock_messages
+    ):
+        """Test that a failing attribute helper neither leaks the span nor hides the error"""
+        mock_span = Mock()
+        mock_tracer.start_as_current_span.return_value.__enter__.return_value = mock_span
+        mock_set_attributes.side_effect = TypeError("bad attribute")
+        mock_llm._generate.side_effect = ValueError("Test error")
+
+        wrapped_llm = spyglass_chatopenai(mock_llm)
+        with pytest.raises(ValueError, match="Test error"):
+            wrapped_llm._generate(mock_messages)
+
+        mock_span.end.assert_called_once()
+        mock_span.set_attribute.assert_any_call("spyglass.enrich.capture_error", True)
+
+    @patch("spyglass_ai.langchain_messages.dumps", return_value="[]")
+    @patch("spyglass_ai.langchain_openai.spyglass_tracer")
+    def test_response_captured_before_langchain_updates_it(
+        self, mock_tracer, mock_json_dumps, mock_llm, mock_messages
+    ):
+        """Test that response attributes come from the result as _generate returned it"""
+        mock_span = Mock()
+        mock_tracer.start_as_current_span.return_value.__enter__.return_value = mock_span
+
+        message = Mock(spec=["content", "tool_calls", "usage_metadata", "response_metadata"])
+        message.content = "Hi"
+        message.tool_calls = None
+        message.usage_metadata = {"input_tokens": 5, "output_tokens": 2, "total_tokens": 7}
+        message.response_metadata = {"model_name": "gpt-4"}
+        mock_result = Mock()
+        mock_result.generations = [Mock(message=message)]
+        mock_llm._generate.return_value = mock_result
+
+        # Defer enrichment so LangChain's post-processing runs before it, as it can in production
+        deferred = []
+        pool = Mock()
+        pool.submit.side_effect = lambda fn, *args: deferred.append((fn, args))
+
+        with patch("spyglass_ai.enrich._ENRICH_POOL", pool):
+            spyglass_chatopenai(mock_llm)._generate(mock_messages)
+
+        message.response_metadata = {"model_name": "replaced"}
+        mock_result.generations[0].message = Mock()
+        fn, args = deferred[0]
+        fn(*args)
+
+        mock_span.set_attribute.assert_any_call("gen_ai.response.model", "gpt-4")
+        mock_span.set_attribute.assert_any_call("gen_ai.usage.total_tokens", 7)
+
+    @patch("spyglass_ai.langchain_messages.dumps", return_value="[]")
+    @patch("spyglass_ai.langchain_openai.spyglass_tracer")
+    def test_parameters_captured_when_the_call_returns(
+        self, mock_tracer, mock_json_dumps, mock_llm, mock_messages
+    ):
+        """Test that sampling parameters changed before enrichment runs are not recorded"""
+        mock_span = Mock()
+        mock_tracer.start_as_current_span.return_value.__enter__.return_value = mock_span
+        mock_llm._generate.return_value = Mock(generations=[])
+        mock_llm.temperature = 0.1
+
+        # Defer enrichment so the instance is reconfigured before it runs
+        deferred = []
+        pool = Mock()
+        pool.submit.side_effect = lambda fn, *args: deferred.append((fn, args))
+
+        with patch("spyglass_ai.enrich._ENRICH_POOL", pool):
+            spyglass_chatopenai(mock_llm)._generate(mock_messages)
+
+        mock_llm.temperature = 0.9
+        fn, args = deferred[0]
+        fn(*args)
+
+        mock_span.set_attribute.assert_any_call("gen_ai.request.temperature", 0.1)
+        recorded = [call[0] for call in mock_span.set_attribute.call_args_list]
+        assert ("gen_ai.request.temperature", 0.9) not in recorded
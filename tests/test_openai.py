@@ -188,6 +188,58 @@ class TestSpyglassOpenAI:
         # Should return the original response
         assert result is expected_response
 
+    def test_does_not_double_wrap(self):
+        """Test that wrapping an already wrapped client is a no-op."""
+        client = MockOpenAIClient()
+        wrapped_client = spyglass_openai(client)
+        traced_create = wrapped_client.chat.completions.create
+
+        assert spyglass_openai(wrapped_client) is wrapped_client
+        assert wrapped_client.chat.completions.create is traced_create
+
+    @patch("spyglass_ai.openai.spyglass_tracer")
+    def test_non_recording_span_skips_attributes(self, mock_tracer):
+        """Test that no attributes are built for spans that are not recording."""
+        mock_span = MagicMock()
+        mock_span.is_recording.return_value = False
+        mock_tracer.start_as_current_span.return_value.__enter__ = Mock(return_value=mock_span)
+        mock_tracer.start_as_current_span.return_value.__exit__ = Mock(return_value=None)
+
+        client = MockOpenAIClient()
+        client.chat.completions.create.return_value = MockOpenAIResponse(usage=MockUsage())
+
+        wrapped_client = spyglass_openai(client)
+        wrapped_client.chat.completions.create(
+            model="gpt-4", messages=[{"role": "user", "content": "Hello"}]
+        )
+
+        mock_span.set_attribute.assert_not_called()
+
+    @patch("spyglass_ai.openai.TRACE_LEVEL", "minimal")
+    @patch("spyglass_ai.openai.spyglass_tracer")
+    def test_minimal_trace_level(self, mock_tracer):
+        """Test that the minimal trace level records only system, model and token counts."""
+        mock_span = MagicMock()
+        mock_tracer.start_as_current_span.return_value.__enter__ = Mock(return_value=mock_span)
+        mock_tracer.start_as_current_span.return_value.__exit__ = Mock(return_value=None)
+
+        client = MockOpenAIClient()
+        client.chat.completions.create.return_value = MockOpenAIResponse(usage=MockUsage())
+
+        wrapped_client = spyglass_openai(client)
+        wrapped_client.chat.completions.create(
+            model="gpt-4", messages=[{"role": "user", "content": "Hello"}], temperature=0.7
+        )
+
+        recorded = [call[0][0] for call in mock_span.set_attribute.call_args_list]
+        assert recorded == [
+            "gen_ai.system",
+            "gen_ai.request.model",
+            "gen_ai.usage.input_tokens",
+            "gen_ai.usage.output_tokens",
+            "gen_ai.usage.total_tokens",
+        ]
+
 
 class TestIntegrationWithRealClient:
     """Integration tests that could work with a real OpenAI client."""
@@ -0,0 +1,315 @@
+import asyncio
+import threading
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from spyglass_ai.semantic_cache import (  # noqa: E402
+    BatchingEmbedder,
+    SemanticCache,
+    _normalize_query,
+)
+
+
+class TestSemanticCache:
+    """Test suite for SemanticCache"""
+
+    @pytest.fixture
+    def mock_embeddings(self):
+        """Create mock embeddings that map known queries to fixed vectors"""
+        vectors = {
+            "what is the capital of france": [1.0, 0.0, 0.0],
+            "tell me france s capital city": [0.99, 0.1, 0.0],
+            "how do i bake bread": [0.0, 1.0, 0.0],
+        }
+        embeddings = Mock()
+        embeddings.embed_query.side_effect = lambda text: vectors.get(text, [0.0, 0.0, 1.0])
+        return embeddings
+
+    @pytest.fixture
+    def mock_span(self):
+        """Patch the current span so cache attributes can be inspected"""
+        span = Mock()
+        with patch("spyglass_ai.semantic_cache.trace.get_current_span", return_value=span):
+            yield span
+
+    def test_normalize_query(self):
+        """Test that normalization ignores case, punctuation and extra whitespace"""
+        assert _normalize_query("  What is the Capital of France?! ") == (
+            "what is the capital of france"
+        )
+
+    def test_miss_computes_and_caches(self, mock_embeddings, mock_span):
+        """Test that a miss calls compute once and caches the result"""
+        cache = SemanticCache(mock_embeddings)
+        compute = Mock(return_value="Paris")
+
+        assert cache.get_or_compute("What is the capital of France?", compute) == "Paris"
+        assert cache.get_or_compute("What is the capital of France?", compute) == "Paris"
+
+        compute.assert_called_once()
+        assert len(cache) == 1
+        # The query is only embedded for the first (missed) lookup
+        assert mock_embeddings.embed_query.call_count == 1
+
+    def test_exact_hit_ignores_formatting(self, mock_embeddings, mock_span):
+        """Test that exact hits skip embedding and set span attributes"""
+        cache = SemanticCache(mock_embeddings)
+        cache.put("What is the capital of France?", "Paris")
+        mock_embeddings.embed_query.reset_mock()
+
+        assert cache.get("what is the capital of FRANCE") == "Paris"
+
+        mock_embeddings.embed_query.assert_not_called()
+        mock_span.set_attribute.assert_any_call("spyglass.cache.hit", True)
+        mock_span.set_attribute.assert_any_call("spyglass.cache.level", "exact")
+
+    def test_semantic_hit(self, mock_embeddings, mock_span):
+        """Test that a similar query above the threshold is served from the cache"""
+        cache = SemanticCache(mock_embeddings)
+        cache.put("What is the capital of France?", "Paris")
+
+        assert cache.get("Tell me France's capital city") == "Paris"
+
+        mock_span.set_attribute.assert_any_call("spyglass.cache.level", "semantic")
+
+    def test_semantic_miss_below_threshold(self, mock_embeddings, mock_span):
+        """Test that dissimilar queries and a strict threshold both miss"""
+        cache = SemanticCache(mock_embeddings, threshold=0.999)
+        cache.put("What is the capital of France?", "Paris")
+
+        assert cache.get("How do I bake bread?") is None
+        assert cache.get("Tell me France's capital city") is None
+        mock_span.set_attribute.assert_any_call("spyglass.cache.hit", False)
+
+    def test_put_existing_query_replaces_response(self, mock_embeddings, mock_span):
+        """Test that re-caching a query updates the response without adding an entry"""
+        cache = SemanticCache(mock_embeddings)
+        cache.put("What is the capital of France?", "Paris")
+        cache.put("what is the capital of france", "Paris, France")
+
+        assert len(cache) == 1
+        assert cache.get("What is the capital of France?") == "Paris, France"
+
+    def test_matrix_grows_past_initial_capacity(self, mock_span):
+        """Test that the embedding matrix grows as entries are added"""
+        embeddings = Mock()
+        embeddings.embed_query.side_effect = lambda text: [float(len(text)), 1.0]
+        cache = SemanticCache(embeddings, threshold=1.1)
+
+        for i in range(100):
+            cache.put(f"query {'x' * i}", i)
+
+        assert len(cache) == 100
+        assert cache.get(f"query {'x' * 99}") == 99
+
+    def test_concurrent_puts_of_a_new_query_add_one_entry(self, mock_span):
+        """Test that racing misses on the same query don't leave a duplicate entry"""
+        # Both puts embed before either appends, as when two requests miss at once
+        barrier = threading.Barrier(2)
+
+        def embed_query(text):
+            barrier.wait(timeout=5)
+            return [1.0, 0.0]
+
+        embeddings = Mock()
+        embeddings.embed_query.side_effect = embed_query
+        cache = SemanticCache(embeddings)
+
+        threads = [
+            threading.Thread(target=cache.put, args=("What is the capital of France?", answer))
+            for answer in ("Paris", "Paris, France")
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert embeddings.embed_query.call_count == 2
+        assert len(cache) == 1
+
+    def test_embedding_arrays_are_not_modified(self, mock_span):
+        """Test that float32 arrays returned by the embeddings are not normalized in place"""
+        vector = np.array([3.0, 4.0], dtype=np.float32)
+        embeddings = Mock()
+        embeddings.embed_query.return_value = vector
+        cache = SemanticCache(embeddings)
+
+        cache.put("What is the capital of France?", "Paris")
+
+        assert vector.tolist() == [3.0, 4.0]
+        assert cache.get("capital of France") == "Paris"
+
+    def test_clear(self, mock_embeddings, mock_span):
+        """Test that clear removes all entries"""
+        cache = SemanticCache(mock_embeddings)
+        cache.put("What is the capital of France?", "Paris")
+
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.get("What is the capital of France?") is None
+
+    def test_requires_numpy(self, mock_embeddings):
+        """Test that a helpful ImportError is raised when numpy is missing"""
+        with patch("spyglass_ai.semantic_cache._NUMPY_AVAILABLE", False):
+            with pytest.raises(ImportError, match="numpy is required"):
+                SemanticCache(mock_embeddings)
+
+    def test_batch_embeddings_option(self, mock_embeddings):
+        """Test that batch_embeddings wraps the embeddings in a BatchingEmbedder"""
+        cache = SemanticCache(mock_embeddings, batch_embeddings=True)
+
+        assert isinstance(cache.embeddings, BatchingEmbedder)
+        assert cache.embeddings.embeddings is mock_embeddings
+
+    @pytest.mark.asyncio
+    async def test_aget_or_compute_uses_async_embeddings(self, mock_span):
+        """Test that the async path awaits aembed_query and the compute coroutine"""
+        embeddings = Mock()
+        embeddings.aembed_query = AsyncMock(return_value=[1.0, 0.0])
+        cache = SemanticCache(embeddings)
+        compute = AsyncMock(return_value="Paris")
+
+        assert await cache.aget_or_compute("Capital of France?", compute) == "Paris"
+        assert await cache.aget_or_compute("Capital of France?", compute) == "Paris"
+        assert await cache.aget("The capital of France") == "Paris"
+
+        compute.assert_awaited_once()
+        embeddings.embed_query.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_async_falls_back_to_thread_for_sync_embeddings(self, mock_span):
+        """Test that sync-only embeddings are run off the event loop"""
+        embeddings = Mock(spec=["embed_query"])
+        embeddings.embed_query.return_value = [1.0, 0.0]
+        cache = SemanticCache(embeddings)
+
+        await cache.aput("Capital of France?", "Paris")
+
+        assert await cache.aget("capital of france") == "Paris"
+        embeddings.embed_query.assert_called_once_with("capital of france")
+
+
+class TestBatchingEmbedder:
+    """Test suite for BatchingEmbedder"""
+
+    def test_concurrent_queries_share_a_batch(self):
+        """Test that concurrent embed_query calls are coalesced into one request"""
+        embeddings = Mock()
+        embeddings.embed_documents.side_effect = lambda texts: [[float(len(t))] for t in texts]
+        embedder = BatchingEmbedder(embeddings, batch_size=4, max_wait_ms=1000)
+
+        texts = ["a", "bb", "ccc", "dddd"]
+        results = {}
+        barrier = threading.Barrier(len(texts))
+
+        def embed(text):
+            barrier.wait()
+            results[text] = embedder.embed_query(text)
+
+        threads = [threading.Thread(target=embed, args=(text,)) for text in texts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert results == {text: [float(len(text))] for text in texts}
+        embeddings.embed_documents.assert_called_once()
+        assert sorted(embeddings.embed_documents.call_args[0][0]) == texts
+
+    def test_flushes_partial_batch_after_max_wait(self):
+        """Test that a lone query is embedded without waiting for a full batch"""
+        embeddings = Mock()
+        embeddings.embed_documents.return_value = [[1.0, 0.0]]
+        embedder = BatchingEmbedder(embeddings, batch_size=16, max_wait_ms=1)
+
+        assert embedder.embed_query("hello") == [1.0, 0.0]
+        embeddings.embed_documents.assert_called_once_with(["hello"])
+
+    def test_errors_propagate_to_callers(self):
+        """Test that embedding failures are raised in the calling thread"""
+        embeddings = Mock()
+        embeddings.embed_documents.side_effect = RuntimeError("quota exceeded")
+        embedder = BatchingEmbedder(embeddings, max_wait_ms=1)
+
+        with pytest.raises(RuntimeError, match="quota exceeded"):
+            embedder.embed_query("hello")
+
+    @pytest.mark.asyncio
+    async def test_cancelled_query_does_not_stall_batch(self):
+        """Test that cancelling one waiting query leaves its batch and the worker working"""
+        release = threading.Event()
+        embeddings = Mock()
+
+        def embed_documents(texts):
+            release.wait(timeout=5)
+            return [[float(len(t))] for t in texts]
+
+        embeddings.embed_documents.side_effect = embed_documents
+        embedder = BatchingEmbedder(embeddings, batch_size=2, max_wait_ms=1000)
+
+        cancelled = asyncio.ensure_future(embedder.aembed_query("a"))
+        sibling = asyncio.ensure_future(embedder.aembed_query("bb"))
+        await asyncio.sleep(0.05)
+        cancelled.cancel()
+        release.set()
+
+        assert await asyncio.wait_for(sibling, timeout=5) == [2.0]
+        assert await asyncio.wait_for(embedder.aembed_query("ccc"), timeout=5) == [3.0]
+        assert embedder._worker.is_alive()
+
+    @pytest.mark.asyncio
+    async def test_query_cancelled_before_flush_is_skipped(self):
+        """Test that queries cancelled while queued are not embedded"""
+        embeddings = Mock()
+        embeddings.embed_documents.side_effect = lambda texts: [[float(len(t))] for t in texts]
+        embedder = BatchingEmbedder(embeddings, batch_size=16, max_wait_ms=200)
+
+        cancelled = asyncio.ensure_future(embedder.aembed_query("a"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        assert await asyncio.wait_for(embedder.aembed_query("bb"), timeout=5) == [2.0]
+        embeddings.embed_documents.assert_called_once_with(["bb"])
+
+    def test_worker_survives_flush_errors(self):
+        """Test that an unexpected error while flushing does not stop the worker"""
+        embeddings = Mock()
+        embeddings.embed_documents.return_value = [[1.0]]
+        embedder = BatchingEmbedder(embeddings, max_wait_ms=1)
+
+        with patch.object(embedder, "_flush", side_effect=RuntimeError("boom")):
+            with pytest.raises(RuntimeError, match="boom"):
+                embedder.embed_query("hello")
+
+        assert embedder.embed_query("hello") == [1.0]
+        assert embedder._worker.is_alive()
+
+    def test_embed_documents_passes_through(self):
+        """Test that embed_documents calls the wrapped embeddings directly"""
+        embeddings = Mock()
+        embeddings.embed_documents.return_value = [[1.0], [2.0]]
+        embedder = BatchingEmbedder(embeddings)
+
+        assert embedder.embed_documents(["a", "b"]) == [[1.0], [2.0]]
+
+    @pytest.mark.parametrize("batch_size", [0, 101])
+    def test_invalid_batch_size(self, batch_size):
+        """Test that batch sizes outside the API limit are rejected"""
+        with pytest.raises(ValueError, match="batch_size must be between 1 and 100"):
+            BatchingEmbedder(Mock(), batch_size=batch_size)
+
+    @pytest.mark.asyncio
+    async def test_async_queries_share_a_batch(self):
+        """Test that concurrent aembed_query calls are coalesced into one request"""
+        embeddings = Mock()
+        embeddings.embed_documents.side_effect = lambda texts: [[float(len(t))] for t in texts]
+        embedder = BatchingEmbedder(embeddings, batch_size=3, max_wait_ms=1000)
+
+        results = await asyncio.gather(*(embedder.aembed_query(t) for t in ["a", "bb", "ccc"]))
+
+        assert results == [[1.0], [2.0], [3.0]]
+        embeddings.embed_documents.assert_called_once()